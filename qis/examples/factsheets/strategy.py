@@ -78,10 +78,39 @@ def generate_equity_bond_portfolio(prices: pd.DataFrame,
     return volparity_portfolio
 
 
+def run_parallel_factsheet(num_years: int = 10, seed: int = 1, end_date: str = '16Oct2024') -> None:
+    """
+    smoke run of generate_strategy_factsheet with is_parallel=True on random prices
+    figures must have the same axes titles as serial run
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=pd.Timestamp(end_date), periods=260*num_years)
+    group_data = pd.Series(dict(SPY='Equities', QQQ='Equities', TLT='Bonds', IEF='Bonds', GLD='Gold'))
+    returns = rng.normal(0.0003, 0.01, size=(len(dates), len(group_data.index)))
+    prices = pd.DataFrame(100.0*np.exp(np.cumsum(returns, axis=0)), index=dates, columns=group_data.index)
+    portfolio_data = generate_volparity_portfolio(prices=prices, group_data=group_data, span=30)
+    time_period = TimePeriod(dates[260], dates[-1])
+    kwargs = dict(portfolio_data=portfolio_data,
+                  benchmark_prices=prices[['SPY', 'TLT']],
+                  time_period=time_period,
+                  ytd_attribution_time_period=TimePeriod(f"31Dec{dates[-1].year - 1}", dates[-1]),
+                  add_grouped_exposures=True,
+                  add_grouped_cum_pnl=True,
+                  **fetch_default_report_kwargs(time_period=time_period, add_rates_data=False))
+    figs = qis.generate_strategy_factsheet(is_parallel=True, **kwargs)
+    figs_serial = qis.generate_strategy_factsheet(is_parallel=False, **kwargs)
+    titles = [[ax.get_title() for ax in fig.axes] for fig in figs]
+    titles_serial = [[ax.get_title() for ax in fig.axes] for fig in figs_serial]
+    if titles != titles_serial:
+        raise ValueError("parallel factsheet differs from serial")
+    print(f"parallel factsheet generated {len(figs)} figures")
+
+
 class UnitTests(Enum):
     VOLPARITY_PORTFOLIO = 1
     EQUITY_BOND = 2
     DELTA1_STRATEGY = 3
+    PARALLEL_FACTSHEET = 4
 
 
 def run_unit_test(unit_test: UnitTests):
@@ -175,6 +204,16 @@ def run_unit_test(unit_test: UnitTests):
                              file_name=f"delta1_strategy_factsheet",
                              local_path=qis.local_path.get_output_path())
 
+    elif unit_test == UnitTests.PARALLEL_FACTSHEET:
+        # run in a child interpreter which must exit after worker processes are closed
+        import sys
+        import subprocess
+        code = "from qis.examples.factsheets.strategy import run_parallel_factsheet; run_parallel_factsheet()"
+        result = subprocess.run([sys.executable, '-c', code], timeout=900)
+        if result.returncode != 0:
+            raise ValueError(f"parallel factsheet process exited with code {result.returncode}")
+        print("parallel factsheet process exited")
+
     # plt.show()
 
 
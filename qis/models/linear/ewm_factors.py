@@ -207,19 +207,22 @@ def compute_portfolio_benchmark_beta_alpha_attribution(instrument_prices: pd.Dat
                                                        time_period: TimePeriod = None,
                                                        beta_freq: str = None,
                                                        factor_beta_span: int = 63,  # quarter
-                                                       residual_name: str = 'Alpha'
+                                                       residual_name: str = 'Alpha',
+                                                       portfolio_benchmark_betas: Optional[pd.DataFrame] = None
                                                        ) -> pd.DataFrame:
     """
     attribution:=alpha_{t} = portfolio_return_{t} - benchmark_return_{t}*beta_{t-1}
     using compounded returns
     portfolio_nav is the gross/net portfolio nav
+    portfolio_benchmark_betas can be passed if already computed for the full period
     """
-    portfolio_benchmark_betas = compute_portfolio_benchmark_betas(instrument_prices=instrument_prices,
-                                                                  exposures=exposures,
-                                                                  benchmark_prices=benchmark_prices,
-                                                                  time_period=None,
-                                                                  beta_freq=beta_freq,
-                                                                  factor_beta_span=factor_beta_span)
+    if portfolio_benchmark_betas is None:
+        portfolio_benchmark_betas = compute_portfolio_benchmark_betas(instrument_prices=instrument_prices,
+                                                                      exposures=exposures,
+                                                                      benchmark_prices=benchmark_prices,
+                                                                      time_period=None,
+                                                                      beta_freq=beta_freq,
+                                                                      factor_beta_span=factor_beta_span)
     joint_attrib = compute_benchmarks_beta_attribution(portfolio_nav=portfolio_nav,
                                                        benchmark_prices=benchmark_prices,
                                                        portfolio_benchmark_betas=portfolio_benchmark_betas,
@@ -369,14 +369,16 @@ def compute_rolling_drawdown_time_under_water(prices: Union[pd.DataFrame, pd.Ser
     # find expanding peak
     peak = prices.expanding(min_periods=1).max()
     drawdown = (prices.divide(peak)-1.0).ffill()  # ffill nans
+    # running count of periods in drawdown reset to zero at each new peak:
+    # count of dd periods since start less the count at the last period out of dd
+    is_in_dd = np.less(prices.to_numpy(), peak.to_numpy())
+    num_dd_periods = np.cumsum(is_in_dd, axis=0)
+    num_dd_periods_at_peak = np.maximum.accumulate(np.where(is_in_dd, 0, num_dd_periods), axis=0)
+    time_under_water = (num_dd_periods - num_dd_periods_at_peak).astype(np.float64)
     if isinstance(prices, pd.DataFrame):
-        is_in_dd = pd.DataFrame(np.where(prices < peak, 1.0, np.nan), index=prices.index, columns=prices.columns)
+        time_under_water = pd.DataFrame(time_under_water, index=prices.index, columns=prices.columns)
     else:
-        is_in_dd = pd.Series(np.where(prices < peak, 1.0, np.nan), index=prices.index, name=prices.name)
-
-    # cumsum until first nan for series
-    time_under_water = is_in_dd.apply(lambda x: x.groupby(x.isna().cumsum()).cumsum(), axis=0)
-    time_under_water = time_under_water.fillna(0.0)
+        time_under_water = pd.Series(time_under_water, index=prices.index, name=prices.name)
     return drawdown, time_under_water
 
 
@@ -156,7 +156,9 @@ from qis.plots.derived.drawdowns import (
 from qis.plots.derived.regime_data import (
     plot_regime_data,
     plot_regime_boxplot,
-    add_bnb_regime_shadows
+    add_bnb_regime_shadows,
+    compute_bnb_regime_spans,
+    add_regime_spans
 )
 
 from qis.plots.derived.desc_table import plot_desc_table
@@ -24,13 +24,21 @@ def plot_rolling_drawdowns(prices: Union[pd.Series, pd.DataFrame],
                            dd_legend_type: DdLegendType = DdLegendType.DETAILED,
                            legend_loc: str = 'lower left',
                            y_limits: Tuple[Optional[float], Optional[float]] = (None, 0.0),
+                           drawdowns: Optional[pd.DataFrame] = None,
                            ax: plt.Subplot = None,
                            **kwargs
                            ) -> plt.Figure:
-
-    if isinstance(prices, pd.Series):
-        prices = prices.to_frame()
-    max_dd_data = pt.compute_rolling_drawdowns(prices=prices)
+    """
+    drawdowns computed by compute_rolling_drawdowns() for prices can be passed to skip the computation
+    """
+    if drawdowns is not None:
+        max_dd_data = drawdowns
+    else:
+        if isinstance(prices, pd.Series):
+            prices = prices.to_frame()
+        max_dd_data = pt.compute_rolling_drawdowns(prices=prices)
+    if isinstance(max_dd_data, pd.Series):
+        max_dd_data = max_dd_data.to_frame()
 
     if dd_legend_type == DdLegendType.NONE:
         legend_loc = None
@@ -65,20 +73,27 @@ def plot_rolling_time_under_water(prices: pd.DataFrame,
                                   var_format: str = '{:,.0f}',
                                   y_limits: Tuple[Optional[float], Optional[float]] = (0.0, None),
                                   legend_loc: str = 'lower left',
+                                  time_under_water: Optional[pd.DataFrame] = None,
                                   ax: plt.Subplot = None,
                                   **kwargs
                                   ) -> plt.Figure:
-    if isinstance(prices, pd.Series):
-        prices = prices.to_frame()
-
-    max_dd_data, time_under_water = pt.compute_rolling_drawdown_time_under_water(prices=prices)
+    """
+    time_under_water computed by compute_rolling_drawdown_time_under_water() for prices can be passed
+    to skip the computation
+    """
+    if time_under_water is None:
+        if isinstance(prices, pd.Series):
+            prices = prices.to_frame()
+        _, time_under_water = pt.compute_rolling_drawdown_time_under_water(prices=prices)
+    if isinstance(time_under_water, pd.Series):
+        time_under_water = time_under_water.to_frame()
 
     if dd_legend_type == DdLegendType.NONE:
         legend_loc = None
         legend_labels = None
     else:
         legend_labels = []
-        for column in max_dd_data.columns:
+        for column in time_under_water.columns:
             avg, quant, nmax, last = pt.compute_avg_max_dd(ds=time_under_water[column], is_max=True)
             if dd_legend_type == DdLegendType.SIMPLE:
                 legend_labels.append(f"{column}, max={var_format.format(nmax)}, last={var_format.format(last)}")
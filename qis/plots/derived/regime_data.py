@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List
 from enum import Enum
 
 # qis
@@ -124,37 +124,59 @@ def add_bnb_regime_shadows(ax: plt.Subplot,
                            **kwargs
                            ) -> None:
 
+    if pivot_prices is None:
+        if benchmark is not None and data_df is not None:
+            if benchmark in data_df.columns:
+                pivot_prices = data_df[benchmark]
+            else:
+                raise KeyError(f"{benchmark} not in {data_df.columns}")
+        else:
+            raise ValueError(f"need pivot_prices or benchmark")
+
+    regime_spans = compute_bnb_regime_spans(pivot_prices=pivot_prices, regime_params=regime_params)
+    add_regime_spans(ax=ax, regime_spans=regime_spans, is_force_lim=is_force_lim, alpha=alpha)
+
+
+def compute_bnb_regime_spans(pivot_prices: pd.Series,
+                             regime_params: BenchmarkReturnsQuantileRegimeSpecs = None
+                             ) -> List[Tuple[pd.Timestamp, pd.Timestamp, str]]:
+    """
+    compute (start, end, color) spans of bear/normal/bull regimes of pivot_prices
+    consecutive periods with the same regime are merged into one span
+    spans can be computed once and added to many axes with add_regime_spans
+    """
     if regime_params is None:
         regime_params = BenchmarkReturnsQuantileRegimeSpecs()
     regime_classifier = BenchmarkReturnsQuantilesRegime(regime_params=regime_params)
-
-    if pivot_prices is not None:
-        benchmark = pivot_prices.name
-    elif benchmark is not None and data_df is not None:
-        if benchmark in data_df.columns:
-            pivot_prices = data_df[benchmark]
-        else:
-            raise KeyError(f"{benchmark} not in {data_df.columns}")
-    else:
-        raise ValueError(f"need pivot_prices or benchmark")
-
     regime_ids = regime_classifier.compute_sampled_returns_with_regime_id(prices=pivot_prices,
-                                                                          benchmark=benchmark,
+                                                                          benchmark=pivot_prices.name,
                                                                           **regime_params._asdict())
-
     regime_id_color = regime_classifier.class_data_to_colors(regime_data=regime_ids[RegimeClassifier.REGIME_COLUMN])
 
     # fill in the first date before the class date
-    price_data_index = pivot_prices.index
-
-    ax.axvspan(xmin=price_data_index[0],
-               xmax=regime_ids.index[0],
-               alpha=alpha,
-               color=regime_id_color.loc[regime_id_color.index[0]], lw=0)
-    for date_1, date in zip(regime_ids.index[:-1], regime_ids.index[1:]):
-        ax.axvspan(xmin=date_1, xmax=date, alpha=alpha, color=regime_id_color[date], lw=0)
-    if is_force_lim:
-        ax.set_xlim(price_data_index[0], regime_ids.index[-1])
+    starts = [pivot_prices.index[0]] + list(regime_ids.index[:-1])
+    ends = list(regime_ids.index)
+    regime_spans = []
+    for start, end, color in zip(starts, ends, regime_id_color.to_numpy()):
+        if len(regime_spans) > 0 and regime_spans[-1][2] == color:
+            regime_spans[-1] = (regime_spans[-1][0], end, color)
+        else:
+            regime_spans.append((start, end, color))
+    return regime_spans
+
+
+def add_regime_spans(ax: plt.Subplot,
+                     regime_spans: List[Tuple[pd.Timestamp, pd.Timestamp, str]],
+                     is_force_lim: bool = True,
+                     alpha: float = 0.3
+                     ) -> None:
+    """
+    draw regime spans computed by compute_bnb_regime_spans
+    """
+    for start, end, color in regime_spans:
+        ax.axvspan(xmin=start, xmax=end, alpha=alpha, color=color, lw=0)
+    if is_force_lim and len(regime_spans) > 0:
+        ax.set_xlim(regime_spans[0][0], regime_spans[-1][1])
 
 
 class UnitTests(Enum):
@@ -56,7 +56,7 @@ def plot_regime_pdf(prices: pd.DataFrame,
                     palette=regime_classifier.get_regime_ids_colors().values(),
                     ax=ax)
 
-    ax.xaxis.set_major_formatter(FuncFormatter(lambda x, _: var_format.format(x)))
+    ax.xaxis.set_major_formatter(FuncFormatter(var_format.format))
 
     put.set_legend(ax=ax, legend_loc=legend_loc, fontsize=fontsize, **kwargs)
 
@@ -100,8 +100,8 @@ def plot_scatter_regression(prices: pd.DataFrame,
         put.add_scatter_points(ax=ax, label_x_y=label_x_y, colors=colors, **kwargs)
 
     put.set_legend(ax=ax, lines=lines, **kwargs)
-    ax.xaxis.set_major_formatter(FuncFormatter(lambda x, _: x_var_format.format(x)))
-    ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: y_var_format.format(y)))
+    ax.xaxis.set_major_formatter(FuncFormatter(x_var_format.format))
+    ax.yaxis.set_major_formatter(FuncFormatter(y_var_format.format))
 
     if xlabel is None:
         xlabel = f"x={regime_benchmark_str}"
@@ -6,8 +6,12 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-import scipy.stats as stats
-from statsmodels import api as sm
+import matplotlib.colors as mcolors
+import matplotlib.transforms as mtransforms
+from functools import lru_cache
+from itertools import repeat
+from scipy.special import stdtrit
+from numba import njit
 from typing import Union, List, Tuple, Optional
 from enum import Enum
 
@@ -49,27 +53,39 @@ def plot_scatter(df: pd.DataFrame,
                  r2_only: bool = False,
                  legend_loc: str = 'upper left',
                  value_name: str = 'value_name',
+                 rasterize_threshold: Optional[int] = 5000,  # single color points of larger samples are rasterized
+                 density_threshold: Optional[int] = None,  # single color points of larger samples are shown as density
                  ax: plt.Subplot = None,
                  **kwargs
                  ) -> plt.Figure:
     """
     x-y scatter of df
     """
-    df = df.copy().dropna()
-
     if x is None:
         if len(df.columns) == 2 or (len(df.columns) == 3 and hue is not None):
             x = df.columns[0]
         else:
             raise ValueError(f"x_column is not defined for more than on columns")
+    y_columns = None
     if y is None:
         if len(df.columns) == 2 or (len(df.columns) == 3 and hue is not None):  # x and y
             y = df.columns[1]
-        else:  # melting to column value_name with hue = all columns ba t x
+            df = df.dropna(subset=[c for c in (x, y, hue) if c is not None])
+        else:  # all columns but x are plotted against x with hue given by column names
             hue = 'hue'
             y = value_name
-            df = pd.melt(df, id_vars=[x], value_vars=df.columns.drop(x), var_name=hue,
-                         value_name=value_name)
+            y_columns = [column for column in df.columns if column != x]
+            df = df.dropna()
+    else:
+        df = df.dropna(subset=[c for c in (x, y, hue) if c is not None])
+
+    # data points in long format, y columns are stacked without melting the frame
+    if y_columns is None:
+        x_all = np.ascontiguousarray(df[x].to_numpy(), dtype=np.float64)
+        y_all = np.ascontiguousarray(df[y].to_numpy(), dtype=np.float64)
+    else:
+        x_all = np.tile(np.ascontiguousarray(df[x].to_numpy(), dtype=np.float64), len(y_columns))
+        y_all = np.ascontiguousarray(df[y_columns].to_numpy(dtype=np.float64).ravel(order='F'))
 
     if hue is not None and add_hue_model_label is None:  # override to true unless false
         add_hue_model_label = True
@@ -79,84 +95,113 @@ def plot_scatter(df: pd.DataFrame,
     else:
         fig = None
 
+    # estimate full sample model once for the regression line, prediction, ci and label
+    full_sample_model = None
+    if full_sample_order is not None and full_sample_order > 0:
+        if hue is None or add_universe_model_prediction or add_universe_model_label or add_universe_model_ci:
+            sort_idx = np.argsort(x_all, kind='stable')
+            x_full = x_all[sort_idx]
+            y_full = y_all[sort_idx]
+            full_sample_model, y_model = qu.fit_poly_ols(x=x_full, y=y_full, order=full_sample_order,
+                                                         fit_intercept=fit_intercept)
+
     estimated_reg_models = {}
     if hue is not None:
+        if y_columns is None:
+            hue_codes, hue_ids = pd.factorize(df[hue])
+            # one sort by hue code and x makes hue groups contiguous and ordered by x
+            group_idx = np.lexsort((x_all, hue_codes))
+            split_points = np.searchsorted(hue_codes[group_idx], np.arange(1, len(hue_ids)))
+            x_groups = np.split(x_all[group_idx], split_points)
+            y_groups = np.split(y_all[group_idx], split_points)
+        else:
+            hue_ids = y_columns
+            n_rows = len(df.index)
+            hue_codes = np.repeat(np.arange(len(y_columns)), n_rows)
+            x_sort_idx = np.argsort(x_all[:n_rows], kind='stable')
+            x_sorted = x_all[:n_rows][x_sort_idx]
+
         if colors is None:
-            colors = qp.get_n_sns_colors(n=len(df[hue].unique()), **kwargs)
+            colors = qp.get_n_sns_colors(n=len(hue_ids), **kwargs)
         palette = colors
 
-        hue_ids = df[hue].unique()
+        # rgba colors of rows taken by hue codes, used for data points and annotations
+        row_colors = mcolors.to_rgba_array(palette)[hue_codes]
+        # plot data points of all hues with one collection
+        ax.scatter(x=x_all, y=y_all, c=row_colors, s=markersize)
+
+        hue_xs, hue_ys, hue_predictions = [], [], []
         for idx, hue_id in enumerate(hue_ids):
             # estimate model equation
-            data_hue = df[df[hue] == hue_id].sort_values(by=x)
-            x_ = data_hue[x].to_numpy()
-            y_ = data_hue[y].to_numpy()
-            x1 = qu.get_ols_x(x=x_, order=order, fit_intercept=fit_intercept)
-            reg_model = sm.OLS(y_, x1).fit()
+            if y_columns is None:
+                x_ = x_groups[idx]
+                y_ = y_groups[idx]
+            else:
+                x_ = x_sorted
+                y_ = y_all[idx*n_rows:(idx+1)*n_rows][x_sort_idx]
+            reg_model, prediction = qu.fit_poly_ols(x=x_, y=y_, order=order, fit_intercept=fit_intercept)
             estimated_reg_models[hue_id] = reg_model
-
-            # plot data points
-            sns.scatterplot(x=x, y=y, data=data_hue, color=palette[idx], s=markersize, ax=ax)
+            hue_xs.append(x_)
+            hue_ys.append(y_)
+            hue_predictions.append(prediction)
 
             if order > 0:  # plot prediction
-                if ci is not None: # not possible to control reg equation in regplot, only use for ci
-                    sns.regplot(x=x, y=y, data=data_hue,
-                                ci=ci,
-                                order=order, truncate=True,
-                                color=palette[idx],
-                                scatter_kws={'s': markersize},
-                                line_kws={'linewidth': linewidth},
-                                ax=ax)
-                else:
-                    prediction = reg_model.predict(x1)
-                    ax.plot(x_, prediction, color=palette[idx], lw=linewidth, linestyle='-')
+                ax.plot(x_, prediction, color=palette[idx], lw=linewidth, linestyle='-')
+
+        if order > 0 and ci is not None:  # analytical ci bands of the fitted models
+            ci_bands = calc_groups_ci(xs=hue_xs, ys=hue_ys, y_models=hue_predictions, quantile=0.5 + ci / 200.0)
+            for idx, (x_, prediction, ci_band) in enumerate(zip(hue_xs, hue_predictions, ci_bands)):
+                if np.all(np.isnan(ci_band)):
+                    continue
+                ax.fill_between(x_, prediction - ci_band, prediction + ci_band,
+                                color=palette[idx], alpha=0.2, lw=0)
 
     else:
         if full_sample_order is None:
             pass
+        elif density_threshold is not None and len(x_all) > density_threshold:
+            plot_points_density(x=x_all, y=y_all, ax=ax)
         elif full_sample_order == 0:  # just scatter plot
-            sns.scatterplot(x=x, y=y, data=df,
-                            # ci=ci,
-                            s=markersize, color=full_sample_color, ax=ax)
-        else:  # regplot add scatter and ml lines even if order is == 0
-            sns.regplot(x=x, y=y, data=df, ci=ci, order=full_sample_order, color=full_sample_color,
-                        scatter_kws={'s': markersize},
-                        line_kws={'linewidth': linewidth}, ax=ax)
+            if rasterize_threshold is not None and len(df.index) > rasterize_threshold:
+                plot_rasterized_points(x=df[x].to_numpy(), y=df[y].to_numpy(), color=full_sample_color,
+                                       markersize=markersize, ax=ax)
+            else:
+                sns.scatterplot(x=x, y=y, data=df,
+                                # ci=ci,
+                                s=markersize, color=full_sample_color, ax=ax)
+        else:  # scatter with the full sample regression line
+            if rasterize_threshold is not None and len(x_full) > rasterize_threshold:
+                plot_rasterized_points(x=x_full, y=y_full, color=full_sample_color, markersize=markersize, ax=ax)
+            else:
+                ax.scatter(x=x_full, y=y_full, s=markersize, color=full_sample_color)
+
+        if full_sample_model is not None:  # full sample regression line
+            ax.plot(x_full, y_model, color=full_sample_color, lw=linewidth, linestyle='-')
+            if ci is not None:  # two-sided band of ci level as in sns.regplot
+                ci_band = calc_ci(x=x_full, y=y_full, y_model=y_model, quantile=0.5 + ci / 200.0)
+                ax.fill_between(x_full, y_model - ci_band, y_model + ci_band,
+                                color=full_sample_color, alpha=0.2, lw=0)
 
     # add ml equations to labels
     legend_labels = []
     legend_colors = []
-    if full_sample_order is not None:
-        if (add_universe_model_prediction or add_universe_model_label or add_universe_model_ci) and full_sample_order > 0:
-            xy = df[[x, y]].sort_values(by=x)
-            x_ = xy[x].to_numpy()
-            y_ = xy[y].to_numpy()
-            x1 = qu.get_ols_x(x=x_, order=full_sample_order, fit_intercept=fit_intercept)
-            reg_model = sm.OLS(y_, x1).fit()
-
-            if add_universe_model_prediction:
-                prediction = reg_model.predict(x1)
-                ax.plot(x, prediction, color=full_sample_color, lw=linewidth, linestyle='--')
-
-            if add_universe_model_ci:
-                y_model = reg_model.predict(x1)
-                ci = calc_ci(x=x, y=y, y_model=y_model)
-                # ax.fill_between(x, y + ci, y - ci, color="None", linestyle="--")
-                ax.plot(x, y_model - ci, "--", color="0.5")
-                ax.plot(x, y_model + ci, "--", color="0.5")
-
-            if add_universe_model_label:
-                text_str = f"{full_sample_label} " \
-                           f"{qu.reg_model_params_to_str(reg_model=reg_model, order=full_sample_order, r2_only=False, fit_intercept=fit_intercept, **kwargs)}"
-                legend_labels.append(text_str)
-                legend_colors.append(full_sample_color)
+    if full_sample_model is not None:
+        if add_universe_model_prediction:
+            ax.plot(x_full, y_model, color=full_sample_color, lw=linewidth, linestyle='--')
+
+        if add_universe_model_ci:
+            ci_band = calc_ci(x=x_full, y=y_full, y_model=y_model)
+            ax.plot(x_full, y_model - ci_band, "--", color="0.5")
+            ax.plot(x_full, y_model + ci_band, "--", color="0.5")
+
+        if add_universe_model_label:
+            text_str = f"{full_sample_label} " \
+                       f"{qu.reg_model_params_to_str(reg_model=full_sample_model, order=full_sample_order, r2_only=False, fit_intercept=fit_intercept, **kwargs)}"
+            legend_labels.append(text_str)
+            legend_colors.append(full_sample_color)
 
-    # add colors for annotation labels
-    df['color'] = full_sample_color
     if hue is not None :
-        hue_ids = df[hue].unique()
         for color, hue_id in zip(colors, hue_ids):
-            df.loc[df[hue] == hue_id, 'color'] = 'red'  # ad color for hue
             if order > 0:
                 if add_hue_model_label:
                     reg_model = estimated_reg_models[hue_id]
@@ -169,26 +214,27 @@ def plot_scatter(df: pd.DataFrame,
                 legend_labels.append(hue_id)
             legend_colors.append(color)
 
-    elif hue is not None and order == 0:
-        legend_labels = df[hue].unique()
-        legend_colors = colors
-
     # add labels
     if annotation_labels is not None:
         if annotation_colors is not None:
             colors = annotation_colors
-        elif annotation_color is not None:
-            colors = len(df.index) * [annotation_color]
+        elif annotation_color is not None:  # single color is repeated lazily in zip
+            colors = repeat(annotation_color)
+        elif hue is not None:
+            colors = row_colors
         else:
-            colors = df['color']
-        for label, x_, y_, color in zip(annotation_labels, df[x], df[y], colors):
-            ax.annotate(label,
-                        xy=(x_, y_), xytext=(1, 1),
-                        textcoords='offset points', ha='left', va='bottom',
-                        color=color,
-                        fontsize=fontsize)
-            if label != '':
-                ax.scatter(x=x_, y=y_, c=color, s=20)
+            colors = repeat(full_sample_color)
+        labelled = [(label, x_, y_, color)
+                    for label, x_, y_, color in zip(annotation_labels, x_all, y_all, colors)
+                    if label != '']
+        if len(labelled) > 0:
+            # one collection for all labelled points, text is shifted by 1 point as with offset annotations
+            _, xs, ys, cs = zip(*labelled)
+            ax.scatter(x=xs, y=ys, c=list(cs), s=20)
+            text_transform = mtransforms.offset_copy(ax.transData, fig=ax.figure, x=1, y=1, units='points')
+            for label, x_, y_, color in labelled:
+                ax.text(x_, y_, label, transform=text_transform, ha='left', va='bottom',
+                        color=color, fontsize=fontsize)
 
     if add_45line:  # make equal:
         ymin, ymax = ax.get_ylim()
@@ -197,8 +243,7 @@ def plot_scatter(df: pd.DataFrame,
         max = ymax if ymax > xmax else xmax
         ax.set_xlim(min, max)
         ax.set_ylim(min, max)
-        x = np.linspace(*ax.get_xlim())
-        ax.plot(x, x, color='black', lw=1, linestyle='--')
+        ax.plot([min, max], [min, max], color='black', lw=1, linestyle='--')
 
     if x_limits is not None:
         qp.set_x_limits(ax=ax, x_limits=x_limits)
@@ -240,6 +285,39 @@ def plot_scatter(df: pd.DataFrame,
     return fig
 
 
+def plot_rasterized_points(x: np.ndarray,
+                           y: np.ndarray,
+                           color: str,
+                           markersize: float,
+                           ax: plt.Subplot
+                           ) -> None:
+    """
+    draw single color points as one rasterized marker line, much faster than scatter for large samples
+    markersize is the marker area as in ax.scatter
+    """
+    ax.plot(x, y, marker='o', linestyle='', markersize=np.sqrt(markersize), markeredgewidth=0.0,
+            color=color, rasterized=True)
+
+
+def plot_points_density(x: np.ndarray,
+                        y: np.ndarray,
+                        ax: plt.Subplot,
+                        bins: int = 512,
+                        cmap: str = 'viridis'
+                        ) -> None:
+    """
+    draw log-count of points on 2d histogram as image, the drawing cost does not depend on the number of points
+    empty bins are left transparent
+    """
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    ax.imshow(np.ma.masked_equal(np.log1p(counts), 0.0).T,
+              origin='lower',
+              extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+              cmap=cmap,
+              aspect='auto',
+              interpolation='nearest')
+
+
 def plot_classification_scatter(df: pd.DataFrame,
                                 x: Optional[str] = None,
                                 y: Optional[str] = None,
@@ -290,36 +368,108 @@ def plot_classification_scatter(df: pd.DataFrame,
     return fig
 
 
-def calc_ci(x: np.ndarray, y: np.ndarray, y_model: np.ndarray) -> np.ndarray:
+@lru_cache(maxsize=256)
+def get_t_critical_value(dof: int, quantile: float = 0.95) -> float:
+    """
+    student-t quantile computed by scipy special function without the rv_continuous overhead, cached by dof
+    """
+    return float(stdtrit(dof, quantile))
+
+
+def calc_ci(x: np.ndarray, y: np.ndarray, y_model: np.ndarray, quantile: float = 0.95) -> np.ndarray:
     n = x.shape[0]
     m = 2
     dof = n - m
-    t = stats.t.ppf(0.95, dof)
+    t = get_t_critical_value(dof=dof, quantile=quantile)
     #x2 = np.linspace(np.min(x), np.max(x), 100)
 
     # Estimates of Error in Data/Model
     resid = y - y_model
     # chi2 = np.sum((resid / y_model) ** 2)  # chi-squared; estimates error in data
     # chi2_red = chi2 / dof  # reduced chi-squared; measures goodness of fit
-    s_err = np.sqrt(np.sum(resid ** 2) / dof)  # standard deviation of the error
+    s_err = np.sqrt(np.dot(resid, resid) / dof)  # standard deviation of the error
+
+    # centre x once and reuse it for the sum of squares
+    dx = x - x.mean()
+    ssx = np.dot(dx, dx)
+    ci = t * s_err * np.sqrt(1.0 / n + dx * dx / ssx)
+    return ci
+
 
-    ci = t * s_err * np.sqrt(1 / n + (x - np.mean(x)) ** 2 / np.sum((x - np.mean(x)) ** 2))
+def calc_groups_ci(xs: List[np.ndarray],
+                   ys: List[np.ndarray],
+                   y_models: List[np.ndarray],
+                   quantile: float = 0.95
+                   ) -> List[np.ndarray]:
+    """
+    calc_ci for a list of samples computed by one compiled call
+    """
+    group_sizes = np.array([len(x) for x in xs])
+    group_starts = np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(group_sizes)))
+    t_values = np.array([get_t_critical_value(dof=int(n) - 2, quantile=quantile) for n in group_sizes])
+    ci = compute_groups_ci(x=np.concatenate(xs),
+                           y=np.concatenate(ys),
+                           y_model=np.concatenate(y_models),
+                           group_starts=group_starts,
+                           t_values=t_values)
+    return np.split(ci, group_starts[1:-1])
+
+
+@njit(cache=True)
+def compute_groups_ci(x: np.ndarray,
+                      y: np.ndarray,
+                      y_model: np.ndarray,
+                      group_starts: np.ndarray,
+                      t_values: np.ndarray
+                      ) -> np.ndarray:
+    """
+    ci of calc_ci for groups stored contiguously in x, y, y_model
+    group i is given by rows group_starts[i]:group_starts[i+1]
+    ci of groups with less than 3 points or constant x is undefined and set to nan
+    """
+    ci = np.empty_like(x)
+    for group in range(len(group_starts) - 1):
+        start, end = group_starts[group], group_starts[group + 1]
+        n = end - start
+        if n <= 2:
+            ci[start:end] = np.nan
+            continue
+        mean_x = 0.0
+        for idx in range(start, end):
+            mean_x += x[idx]
+        mean_x /= n
+        ssx = 0.0
+        sse = 0.0
+        for idx in range(start, end):
+            dx = x[idx] - mean_x
+            ssx += dx * dx
+            resid = y[idx] - y_model[idx]
+            sse += resid * resid
+        if ssx == 0.0:
+            ci[start:end] = np.nan
+            continue
+        s_err = np.sqrt(sse / (n - 2))
+        for idx in range(start, end):
+            dx = x[idx] - mean_x
+            ci[idx] = t_values[group] * s_err * np.sqrt(1.0 / n + dx * dx / ssx)
     return ci
 
 
 def get_random_data(is_random_beta: bool = True,
-                    n: int = 10000
+                    n: int = 10000,
+                    seed: Optional[int] = None
                     ) -> pd.DataFrame:
 
-    x = np.random.normal(0.0, 1.0, n)
-    eps = np.random.normal(0.0, 1.0, n)
+    rng = np.random.default_rng(seed)
+    x = rng.standard_normal(n)
+    eps = rng.standard_normal(n)
     if is_random_beta:
-        beta = np.random.normal(1.0, 1.0, n)*np.square(x)
+        beta = rng.normal(1.0, 1.0, n)*np.square(x)
     else:
-        beta = np.ones(n)
+        beta = 1.0
     y = beta*x + eps
-    df = pd.concat([pd.Series(x, name='x'), pd.Series(y, name='y')], axis=1)
-    df = df.sort_values(by='x', axis=0)
+    sort_idx = np.argsort(x)
+    df = pd.DataFrame({'x': x[sort_idx], 'y': y[sort_idx]})
 
     return df
 
@@ -359,8 +509,7 @@ def estimate_classification_scatter(df: pd.DataFrame,
         data_hue = df.sort_values(by=x)
         x_ = data_hue[x].to_numpy()
         y_ = data_hue[y].to_numpy()
-        x1 = qu.get_ols_x(x=x_, order=order, fit_intercept=fit_intercept)
-        reg_model = sm.OLS(y_, x1).fit()
+        reg_model, _ = qu.fit_poly_ols(x=x_, y=y_, order=order, fit_intercept=fit_intercept)
         x_hue = np.extract(np.logical_and(x_range>=np.min(x_), x_range<np.max(x_)), x_range)
         y_hue = reg_model.predict(x_hue)
         y_rpeds.append(pd.Series(y_hue, index=x_hue))
@@ -376,8 +525,7 @@ class UnitTests(Enum):
 
 def run_unit_test(unit_test: UnitTests):
 
-    np.random.seed(2)
-    df = get_random_data(n=100000)
+    df = get_random_data(n=100000, seed=2)
     print(df)
 
     if unit_test == UnitTests.SCATTER:
@@ -39,11 +39,18 @@ def plot_time_series(df: Union[pd.Series, pd.DataFrame],
                      x_limits: Tuple[Optional[float], Optional[float]] = None,
                      y_limits: Tuple[Optional[float], Optional[float]] = None,
                      is_log: bool = False,
+                     cumulative: bool = False,
                      ax: plt.Subplot = None,
                      **kwargs
                      ) -> Optional[plt.Figure]:
-
-    data1 = df.copy()
+    """
+    plot columns of df as lines
+    with cumulative=True cumulative sums of df are plotted without the caller materialising df.cumsum()
+    """
+    if cumulative:  # cumsum creates new data in place of copy, nans are kept as nans
+        data1 = df.cumsum(axis=0)
+    else:
+        data1 = df.copy()
     if isinstance(data1, pd.DataFrame):
         pass
     elif isinstance(data1, pd.Series):
@@ -140,7 +140,7 @@ def set_ax_ticks_format(ax: plt.Subplot,
 
     # Tick formatters
     if xvar_format is not None:
-        ax.xaxis.set_major_formatter(mticker.FuncFormatter(lambda z, _: xvar_format.format(z)))
+        ax.xaxis.set_major_formatter(mticker.FuncFormatter(xvar_format.format))
 
     for z in ax.get_xticklabels():
         z.set_fontsize(fontsize=fontsize)
@@ -148,7 +148,7 @@ def set_ax_ticks_format(ax: plt.Subplot,
     # set y - ticks
     ax.yaxis.set_minor_formatter(mticker.NullFormatter())  # always remove minor ticks
     if yvar_format is not None:
-        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda z, _: yvar_format.format(z)))
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(yvar_format.format))
     for z in ax.get_yticklabels():
         z.set_fontsize(fontsize=fontsize)
     ax.tick_params(axis='x', rotation=x_rotation)
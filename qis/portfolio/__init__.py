@@ -29,7 +29,8 @@ from qis.portfolio.reports.brinson_attribution import (compute_brinson_attributi
 
 from qis.portfolio.reports.multi_assets_factsheet import (MultiAssetsReport, generate_multi_asset_factsheet)
 
-from qis.portfolio.reports.strategy_factsheet import generate_strategy_factsheet
+from qis.portfolio.reports.strategy_factsheet import (generate_strategy_factsheet,
+                                                      generate_strategy_factsheet_iter)
 
 from qis.portfolio.reports.strategy_benchmark_factsheet import (generate_strategy_benchmark_factsheet_plt,
                                                                 generate_strategy_benchmark_active_perf_plt)
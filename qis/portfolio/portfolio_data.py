@@ -357,7 +357,7 @@ class PortfolioData:
                 turnover = pd.concat([turnover.sum(axis=1).rename(self.nav.name), turnover], axis=1)
 
         if roll_period is not None:
-            turnover = turnover.rolling(roll_period).sum()
+            turnover = compute_rolling_sum_df(df=turnover, window=roll_period)
         elif freq is not None:
             turnover = turnover.resample(freq).sum()
         if time_period is not None:
@@ -390,7 +390,7 @@ class PortfolioData:
                 costs = pd.concat([costs.sum(axis=1).rename(self.nav.name), costs], axis=1)
 
         if roll_period is not None:
-            costs = costs.rolling(roll_period).sum()
+            costs = compute_rolling_sum_df(df=costs, window=roll_period)
         elif freq is not None:
             costs = costs.resample(freq).sum()
         if time_period is not None:
@@ -460,11 +460,14 @@ class PortfolioData:
                                                 time_period: TimePeriod = None,
                                                 beta_freq: str = 'B',
                                                 factor_beta_span: int = 63,  # quarter
-                                                residual_name: str = 'Alpha'
+                                                residual_name: str = 'Alpha',
+                                                portfolio_benchmark_betas: Optional[pd.DataFrame] = None
                                                 ) -> pd.DataFrame:
         """
         attribution = portfolio_return_{t} - benchmark_return_{t}*bet_{t-1}
         returns are compounded
+        portfolio_benchmark_betas computed by compute_portfolio_benchmark_betas() with time_period=None can be passed
+        to skip the refit of ewm betas
         """
         instrument_prices = self.prices
         benchmark_prices = benchmark_prices.reindex(index=instrument_prices.index, method='ffill')
@@ -477,7 +480,8 @@ class PortfolioData:
                                                                              time_period=time_period,
                                                                              beta_freq=beta_freq,
                                                                              factor_beta_span=factor_beta_span,
-                                                                             residual_name=residual_name)
+                                                                             residual_name=residual_name,
+                                                                             portfolio_benchmark_betas=portfolio_benchmark_betas)
         return joint_attrib
 
     """
@@ -1646,6 +1650,46 @@ def compute_realized_pnl(prices: np.ndarray,
     return avg_costs, realized_pnl, mtm_pnl, trades
 
 
+@njit(cache=True)
+def compute_rolling_sum(a: np.ndarray, window: int) -> np.ndarray:
+    """
+    rolling sum over columns of 2-d array in one pass with running sums
+    same as rolling(window).sum(): sums of windows with less than window finite values are nans
+    """
+    nrows, ncols = a.shape
+    rolling_sum = np.full((nrows, ncols), np.nan)
+    for col in range(ncols):
+        running_sum = 0.0
+        num_finite = 0
+        for row in range(nrows):
+            value = a[row, col]
+            if np.isfinite(value):
+                running_sum += value
+                num_finite += 1
+            if row >= window:
+                value_out = a[row - window, col]
+                if np.isfinite(value_out):
+                    running_sum -= value_out
+                    num_finite -= 1
+            if num_finite == 0:  # reset accumulated rounding errors
+                running_sum = 0.0
+            elif num_finite == window:
+                rolling_sum[row, col] = running_sum
+    return rolling_sum
+
+
+def compute_rolling_sum_df(df: Union[pd.DataFrame, pd.Series], window: int) -> Union[pd.DataFrame, pd.Series]:
+    """
+    df.rolling(window).sum() computed with numba kernel
+    """
+    if isinstance(df, pd.Series):
+        rolling_sum = compute_rolling_sum(a=df.to_numpy(dtype=np.float64).reshape(-1, 1), window=window)
+        return pd.Series(rolling_sum[:, 0], index=df.index, name=df.name)
+    else:
+        rolling_sum = compute_rolling_sum(a=df.to_numpy(dtype=np.float64), window=window)
+        return pd.DataFrame(rolling_sum, index=df.index, columns=df.columns)
+
+
 class AllocationType(EnumMap):
     EW = 1
     FIXED_WEIGHTS = 2
@@ -4,17 +4,327 @@ PortfolioData object can be generated by a backtester or actucal strategy data
 with comparison to 1-2 cash benchmarks
 PortfolioData can contain either simulated or actual portfolio data
 """
+import os
+import multiprocessing
 import numpy as np
 # packages
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import Tuple, Optional, List, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pandas.tseries.frequencies import to_offset
+from dataclasses import dataclass
+from typing import Tuple, Optional, List, Union, Dict, Any, Callable, Iterator
 import qis as qis
 from qis import TimePeriod, PerfParams, BenchmarkReturnsQuantileRegimeSpecs
 from qis.portfolio.portfolio_data import PortfolioData
 from qis.portfolio.reports.config import PERF_PARAMS, REGIME_PARAMS
 
+# inferred frequencies of daily data for which ra tables use weekly regressions
+DAILY_FREQS = frozenset({'B', 'D', 'C'})
+
+
+def reindex_ffill(df: pd.DataFrame, index: pd.Index) -> pd.DataFrame:
+    """
+    same as df.reindex(index=index, method='ffill') for sorted df.index
+    rows are located with searchsorted and taken in one pass, dates before the first row of df are nans
+    """
+    idx = df.index.searchsorted(index, side='right') - 1
+    values = df.to_numpy(dtype=np.float64).take(np.maximum(idx, 0), axis=0)
+    values[idx < 0] = np.nan
+    return pd.DataFrame(values, index=index, columns=df.columns)
+
+
+def resample_last_row(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    take the last row of each period of freq without resample binning
+    dates are rolled forward to the period end with zero-multiple offset, which gives resample labels
+    unlike resample(freq).last() periods without data are skipped and nans in the last row are kept
+    """
+    period_ends = df.index + to_offset(freq) * 0
+    is_last = np.append(period_ends[1:] != period_ends[:-1], True)
+    return df.iloc[is_last].set_axis(period_ends[is_last], axis=0)
+
+
+@dataclass
+class FactsheetCache:
+    """
+    portfolio and benchmark data shared by the panels of strategy factsheet
+    computed once for the factsheet time_period and passed explicitly to plotting functions
+    """
+    portfolio_nav: pd.Series
+    benchmark_prices: pd.DataFrame  # aligned to portfolio nav index
+    benchmark_price1: Union[pd.Series, pd.DataFrame]  # benchmarks for ra tables
+    regime_benchmark_price: pd.Series  # aligned prices of regime benchmark
+    joint_prices: Union[pd.Series, pd.DataFrame]
+    pivot_prices: pd.Series  # for regime shadows
+    drawdowns: pd.DataFrame  # of joint_prices
+    time_under_water: pd.DataFrame  # of joint_prices
+    regime_spans: List[Tuple[pd.Timestamp, pd.Timestamp, str]]  # bnb regime shadows of pivot_prices
+    exposures: pd.DataFrame
+    turnover: pd.DataFrame
+    costs: pd.DataFrame
+    num_investable_instruments: pd.DataFrame
+    freq: Optional[str] = None  # inferred frequency of turnover and costs
+    benchmark_freq: Optional[str] = None  # inferred frequency of aligned benchmark prices
+    factor_betas: Optional[pd.DataFrame] = None  # betas for full nav period
+    time_period_1y: Optional[TimePeriod] = None  # last year of time_period
+
+
+def compute_factsheet_cache(portfolio_data: PortfolioData,
+                            benchmark_prices: pd.DataFrame,
+                            time_period: TimePeriod,
+                            regime_benchmark: str,
+                            is_grouped: bool,
+                            regime_params: BenchmarkReturnsQuantileRegimeSpecs = REGIME_PARAMS,
+                            add_benchmarks_to_navs: bool = False,
+                            exposures_freq: Optional[str] = 'W-WED',
+                            turnover_rolling_period: int = 260,
+                            turnover_freq: str = 'B',
+                            is_norm_costs: bool = True,
+                            add_factor_betas: bool = True,
+                            factor_beta_span: int = 52,
+                            beta_freq: str = 'W-WED'
+                            ) -> FactsheetCache:
+    """
+    compute data of portfolio_data used in strategy factsheet
+    """
+    benchmark_prices = reindex_ffill(df=benchmark_prices, index=portfolio_data.nav.index)
+
+    regime_benchmark_price = benchmark_prices[regime_benchmark]
+
+    portfolio_nav = portfolio_data.get_portfolio_nav(time_period=time_period)
+    if add_benchmarks_to_navs:
+        benchmark_price1 = benchmark_prices
+        benchmark_columns = list(benchmark_prices.columns)
+    else:
+        benchmark_price1 = regime_benchmark_price
+        benchmark_columns = [regime_benchmark]
+    # same as pd.concat([portfolio_nav, benchmark_price1], axis=1).dropna() with one nan mask over values
+    joint_values = np.column_stack([portfolio_nav.to_numpy(),
+                                    benchmark_price1.reindex(index=portfolio_nav.index).to_numpy()])
+    is_valid = np.logical_not(np.isnan(joint_values).any(axis=1))
+    joint_prices = pd.DataFrame(joint_values[is_valid],
+                                index=portfolio_nav.index[is_valid],
+                                columns=[portfolio_nav.name] + benchmark_columns)
+    pivot_prices = joint_prices[regime_benchmark]
+    if not add_benchmarks_to_navs:
+        joint_prices = joint_prices[portfolio_nav.name]
+    # regime shadows are shared by all time series panels
+    regime_spans = qis.compute_bnb_regime_spans(pivot_prices=pivot_prices, regime_params=regime_params)
+
+    # shared by drawdown and time under water panels
+    joint_prices_df = joint_prices.to_frame() if isinstance(joint_prices, pd.Series) else joint_prices
+    drawdowns = qis.compute_rolling_drawdowns(prices=joint_prices_df)
+    _, time_under_water = qis.compute_rolling_drawdown_time_under_water(prices=joint_prices_df)
+
+    exposures = portfolio_data.get_weights(is_grouped=is_grouped, time_period=time_period, add_total=False)
+    if exposures_freq is not None:  # weights are already ffilled so last row is the last value
+        exposures = resample_last_row(df=exposures, freq=exposures_freq)
+
+    turnover = portfolio_data.get_turnover(time_period=time_period, roll_period=turnover_rolling_period,
+                                           freq=turnover_freq,
+                                           is_grouped=is_grouped)
+    costs = portfolio_data.get_costs(time_period=time_period, roll_period=turnover_rolling_period,
+                                     freq=turnover_freq,
+                                     is_grouped=is_grouped,
+                                     is_norm_costs=is_norm_costs)
+    num_investable_instruments = portfolio_data.get_num_investable_instruments(time_period=time_period)
+
+    # turnover and costs share the same index so the frequency is inferred once
+    freq = pd.infer_freq(turnover.index)
+    benchmark_freq = pd.infer_freq(benchmark_prices.index)
+
+    if add_factor_betas:  # betas are fitted once and shared by exposures and attribution
+        factor_betas = portfolio_data.compute_portfolio_benchmark_betas(benchmark_prices=benchmark_prices,
+                                                                        time_period=None,
+                                                                        beta_freq=beta_freq,
+                                                                        factor_beta_span=factor_beta_span)
+    else:
+        factor_betas = None
+
+    time_period_1y = qis.get_time_period_shifted_by_years(time_period=time_period)
+
+    return FactsheetCache(portfolio_nav=portfolio_nav,
+                          benchmark_prices=benchmark_prices,
+                          benchmark_price1=benchmark_price1,
+                          regime_benchmark_price=regime_benchmark_price,
+                          joint_prices=joint_prices,
+                          pivot_prices=pivot_prices,
+                          drawdowns=drawdowns,
+                          time_under_water=time_under_water,
+                          regime_spans=regime_spans,
+                          exposures=exposures,
+                          turnover=turnover,
+                          costs=costs,
+                          num_investable_instruments=num_investable_instruments,
+                          freq=freq,
+                          benchmark_freq=benchmark_freq,
+                          factor_betas=factor_betas,
+                          time_period_1y=time_period_1y)
+
+
+def get_strategy_factsheet_sheets(portfolio_data: PortfolioData,
+                                  benchmark_prices: Union[pd.DataFrame, pd.Series],
+                                  time_period: TimePeriod,
+                                  ytd_attribution_time_period: TimePeriod = qis.get_ytd_time_period(),
+                                  perf_params: PerfParams = PERF_PARAMS,
+                                  regime_params: BenchmarkReturnsQuantileRegimeSpecs = REGIME_PARAMS,
+                                  regime_benchmark: str = None,  # default is set to benchmark_prices.columns[0]
+                                  exposures_freq: Optional[str] = 'W-WED',  #'W-WED',
+                                  turnover_rolling_period: int = 260,
+                                  turnover_freq: str = 'B',
+                                  factor_beta_span: int = 52,
+                                  beta_freq: str = 'W-WED',
+                                  vol_rolling_window: int = 13,
+                                  return_rolling_window: int = 260,
+                                  add_benchmarks_to_navs: bool = False,
+                                  figsize: Tuple[float, float] = (8.5, 11.7),  # A4 for portrait
+                                  fontsize: int = 4,
+                                  weight_change_sample_size: int = 20,
+                                  weight_report_time_period: TimePeriod = None,
+                                  add_current_position_var_risk_sheet: bool = True,
+                                  add_weights_turnover_sheet: bool = True,
+                                  add_grouped_exposures: bool = False,
+                                  add_grouped_cum_pnl: bool = False,
+                                  add_weight_change_report: bool = False,
+                                  add_current_signal_report: bool = False,
+                                  add_instrument_history_report: bool = False,
+                                  y_limits_signal: Tuple[Optional[float], Optional[float]] = (-1.0, 1.0),
+                                  is_1y_exposures: bool = False,
+                                  is_grouped: Optional[bool] = None,
+                                  dd_legend_type: qis.DdLegendType = qis.DdLegendType.SIMPLE,
+                                  is_norm_costs: bool = True,
+                                  df_to_add: pd.DataFrame = None,
+                                  factsheet_name: str = None,
+                                  **kwargs
+                                  ) -> List[Tuple[Callable[..., plt.Figure], Dict[str, Any]]]:
+    """
+    compute factsheet cache and get list of sheet generators with their arguments
+    """
+    # align
+    if isinstance(benchmark_prices, pd.Series):
+        benchmark_prices = benchmark_prices.to_frame()
+
+    if regime_benchmark is None:
+        regime_benchmark = benchmark_prices.columns[0]
+
+    if is_grouped is None:
+        if len(portfolio_data.group_data.unique()) <= 10:  # otherwise tables look too bad
+            is_grouped = True
+        else:
+            is_grouped = False
+
+    cache = compute_factsheet_cache(portfolio_data=portfolio_data,
+                                    benchmark_prices=benchmark_prices,
+                                    time_period=time_period,
+                                    regime_benchmark=regime_benchmark,
+                                    is_grouped=is_grouped,
+                                    regime_params=regime_params,
+                                    add_benchmarks_to_navs=add_benchmarks_to_navs,
+                                    exposures_freq=exposures_freq,
+                                    turnover_rolling_period=turnover_rolling_period,
+                                    turnover_freq=turnover_freq,
+                                    is_norm_costs=is_norm_costs,
+                                    add_factor_betas=add_current_position_var_risk_sheet,
+                                    factor_beta_span=factor_beta_span,
+                                    beta_freq=beta_freq)
+
+    plot_kwargs = dict(fontsize=fontsize,
+                       linewidth=0.5,
+                       digits_to_show=1, sharpe_digits=2,
+                       weight='normal',
+                       markersize=1,
+                       framealpha=0.75)
+    kwargs = {**kwargs, **plot_kwargs}
+
+    # list of sheet generators with their arguments
+    sheets: List[Tuple[Callable[..., plt.Figure], Dict[str, Any]]] = []
+    sheets.append((generate_performance_sheet,
+                   dict(portfolio_data=portfolio_data, cache=cache, time_period=time_period,
+                        perf_params=perf_params, regime_params=regime_params,
+                        turnover_rolling_period=turnover_rolling_period, return_rolling_window=return_rolling_window,
+                        add_benchmarks_to_navs=add_benchmarks_to_navs, is_grouped=is_grouped,
+                        dd_legend_type=dd_legend_type, figsize=figsize, factsheet_name=factsheet_name,
+                        **kwargs)))
+
+    if add_current_position_var_risk_sheet:
+        sheets.append((generate_var_risk_sheet,
+                       dict(portfolio_data=portfolio_data, cache=cache, time_period=time_period,
+                            perf_params=perf_params, regime_params=regime_params,
+                            is_grouped=is_grouped, vol_rolling_window=vol_rolling_window,
+                            factor_beta_span=factor_beta_span, beta_freq=beta_freq, figsize=figsize,
+                            **kwargs)))
+
+    if add_weights_turnover_sheet:
+        sheets.append((generate_weights_turnover_sheet,
+                       dict(portfolio_data=portfolio_data, time_period=time_period,
+                            ytd_attribution_time_period=ytd_attribution_time_period,
+                            is_norm_costs=is_norm_costs, figsize=figsize,
+                            **kwargs)))
+
+    if add_current_signal_report and portfolio_data.strategy_signal_data is not None:
+        sheets.append((qis.generate_current_signal_report,
+                       dict(portfolio_data=portfolio_data,
+                            **{**kwargs, 'fontsize': 5, 'figsize': figsize, 'y_limits': y_limits_signal})))
+
+    if add_weight_change_report and portfolio_data.strategy_signal_data is not None:
+        sheets.append((qis.generate_weight_change_report,
+                       dict(portfolio_data=portfolio_data,
+                            time_period=weight_report_time_period or time_period,
+                            sample_size=weight_change_sample_size,
+                            is_grouped=True,
+                            **{**kwargs, 'fontsize': 5, 'figsize': figsize})))
+
+    # set 1y time period for exposures
+    if is_1y_exposures:
+        time_period1 = cache.time_period_1y
+        regime_params1 = BenchmarkReturnsQuantileRegimeSpecs(freq='ME')
+    else:
+        time_period1 = weight_report_time_period or time_period
+        regime_params1 = regime_params
+    if add_grouped_exposures or add_grouped_cum_pnl:  # regime shadows are shared by grouped sheets
+        regime_spans1 = qis.compute_bnb_regime_spans(pivot_prices=time_period1.locate(cache.pivot_prices),
+                                                     regime_params=regime_params1)
+    else:
+        regime_spans1 = None
+
+    if add_grouped_exposures:
+        sheets.append((generate_grouped_exposures_sheet,
+                       dict(portfolio_data=portfolio_data, cache=cache, time_period=time_period1,
+                            regime_spans=regime_spans1, figsize=figsize,
+                            **kwargs)))
+
+    if add_grouped_cum_pnl:
+        sheets.append((generate_grouped_cum_pnl_sheet,
+                       dict(portfolio_data=portfolio_data, cache=cache, time_period=time_period1,
+                            regime_spans=regime_spans1, figsize=figsize,
+                            **kwargs)))
+
+    if add_instrument_history_report:
+        sheets.append((generate_instrument_history_sheet,
+                       dict(portfolio_data=portfolio_data, df_to_add=df_to_add, figsize=figsize,
+                            **kwargs)))
+
+    return sheets
+
+
+def generate_strategy_factsheet_iter(portfolio_data: PortfolioData,
+                                     benchmark_prices: Union[pd.DataFrame, pd.Series],
+                                     time_period: TimePeriod,
+                                     **kwargs
+                                     ) -> Iterator[plt.Figure]:
+    """
+    generate strategy factsheet figures one at a time, kwargs are passed to get_strategy_factsheet_sheets()
+    next sheet is built only when requested so callers can save and close each figure before the next one
+    """
+    sheets = get_strategy_factsheet_sheets(portfolio_data=portfolio_data,
+                                           benchmark_prices=benchmark_prices,
+                                           time_period=time_period,
+                                           **kwargs)
+    for sheet_generator, sheet_kwargs in sheets:
+        yield sheet_generator(**sheet_kwargs)
+
 
 def generate_strategy_factsheet(portfolio_data: PortfolioData,
                                 benchmark_prices: Union[pd.DataFrame, pd.Series],
@@ -49,73 +359,139 @@ def generate_strategy_factsheet(portfolio_data: PortfolioData,
                                 is_norm_costs: bool = True,
                                 df_to_add: pd.DataFrame = None,
                                 factsheet_name: str = None,
+                                *,
+                                is_parallel: bool = False,
                                 **kwargs
                                 ) -> List[plt.Figure]:
-    # align
-    if isinstance(benchmark_prices, pd.Series):
-        benchmark_prices = benchmark_prices.to_frame()
+    """
+    generate strategy factsheet figures
+    with is_parallel=True sheets are generated in worker processes with Agg backend and pickled back
+    """
+    sheets = get_strategy_factsheet_sheets(portfolio_data=portfolio_data,
+                                           benchmark_prices=benchmark_prices,
+                                           time_period=time_period,
+                                           ytd_attribution_time_period=ytd_attribution_time_period,
+                                           perf_params=perf_params,
+                                           regime_params=regime_params,
+                                           regime_benchmark=regime_benchmark,
+                                           exposures_freq=exposures_freq,
+                                           turnover_rolling_period=turnover_rolling_period,
+                                           turnover_freq=turnover_freq,
+                                           factor_beta_span=factor_beta_span,
+                                           beta_freq=beta_freq,
+                                           vol_rolling_window=vol_rolling_window,
+                                           return_rolling_window=return_rolling_window,
+                                           add_benchmarks_to_navs=add_benchmarks_to_navs,
+                                           figsize=figsize,
+                                           fontsize=fontsize,
+                                           weight_change_sample_size=weight_change_sample_size,
+                                           weight_report_time_period=weight_report_time_period,
+                                           add_current_position_var_risk_sheet=add_current_position_var_risk_sheet,
+                                           add_weights_turnover_sheet=add_weights_turnover_sheet,
+                                           add_grouped_exposures=add_grouped_exposures,
+                                           add_grouped_cum_pnl=add_grouped_cum_pnl,
+                                           add_weight_change_report=add_weight_change_report,
+                                           add_current_signal_report=add_current_signal_report,
+                                           add_instrument_history_report=add_instrument_history_report,
+                                           y_limits_signal=y_limits_signal,
+                                           is_1y_exposures=is_1y_exposures,
+                                           is_grouped=is_grouped,
+                                           dd_legend_type=dd_legend_type,
+                                           is_norm_costs=is_norm_costs,
+                                           df_to_add=df_to_add,
+                                           factsheet_name=factsheet_name,
+                                           **kwargs)
+    if is_parallel and len(sheets) > 1:
+        figs = generate_sheets_in_processes(sheets=sheets)
+    else:
+        figs = [sheet_generator(**sheet_kwargs) for sheet_generator, sheet_kwargs in sheets]
+    return figs
 
-    benchmark_prices = benchmark_prices.reindex(index=portfolio_data.nav.index, method='ffill')
-    if regime_benchmark is None:
-        regime_benchmark = benchmark_prices.columns[0]
 
-    if is_grouped is None:
-        if len(portfolio_data.group_data.unique()) <= 10:  # otherwise tables look too bad
-            is_grouped = True
-        else:
-            is_grouped = False
+def generate_sheet_with_agg_backend(sheet_generator: Callable[..., plt.Figure],
+                                    sheet_kwargs: Dict[str, Any]
+                                    ) -> plt.Figure:
+    """
+    run by worker process: figure is rendered with Agg backend and pickled back
+    """
+    plt.switch_backend('Agg')
+    return sheet_generator(**sheet_kwargs)
+
+
+def generate_sheets_in_processes(sheets: List[Tuple[Callable[..., plt.Figure], Dict[str, Any]]],
+                                 max_workers: Optional[int] = None
+                                 ) -> List[plt.Figure]:
+    """
+    generate independent sheets in a process pool, figures are returned in the order of sheets
+    workers are spawned rather than forked: forking after numba or blas thread pools are started can deadlock
+    so scripts calling with is_parallel=True must guard their entry point with if __name__ == '__main__'
+    """
+    if max_workers is None:
+        max_workers = min(4, os.cpu_count() or 1)
+    figs = [None] * len(sheets)
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(sheets)),
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {executor.submit(generate_sheet_with_agg_backend, sheet_generator, sheet_kwargs): idx
+                   for idx, (sheet_generator, sheet_kwargs) in enumerate(sheets)}
+        for future in as_completed(futures):
+            figs[futures[future]] = future.result()
+    return figs
 
-    fig = plt.figure(figsize=figsize, constrained_layout=True)
-    gs = fig.add_gridspec(nrows=14, ncols=4, wspace=0.0, hspace=0.0)
 
-    plot_kwargs = dict(fontsize=fontsize,
-                       linewidth=0.5,
-                       digits_to_show=1, sharpe_digits=2,
-                       weight='normal',
-                       markersize=1,
-                       framealpha=0.75)
-    kwargs = qis.update_kwargs(kwargs, plot_kwargs)
+def generate_performance_sheet(portfolio_data: PortfolioData,
+                               cache: FactsheetCache,
+                               time_period: TimePeriod,
+                               perf_params: PerfParams = PERF_PARAMS,
+                               regime_params: BenchmarkReturnsQuantileRegimeSpecs = REGIME_PARAMS,
+                               turnover_rolling_period: int = 260,
+                               return_rolling_window: int = 260,
+                               add_benchmarks_to_navs: bool = False,
+                               is_grouped: bool = True,
+                               dd_legend_type: qis.DdLegendType = qis.DdLegendType.SIMPLE,
+                               figsize: Tuple[float, float] = (8.5, 11.7),
+                               factsheet_name: str = None,
+                               **kwargs
+                               ) -> plt.Figure:
+    """
+    main sheet of strategy factsheet with performance, exposures, turnover and attribution
+    """
+
+    fig = plt.figure(figsize=figsize, constrained_layout=False)
+    fig.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.04, wspace=0.45, hspace=1.4)
+    gs = fig.add_gridspec(nrows=14, ncols=4)
+
     if factsheet_name is None:
         factsheet_name = f"{portfolio_data.nav.name} factsheet"
     fig.suptitle(factsheet_name, fontweight="bold", fontsize=8, color='blue')
 
     # prices
-    portfolio_nav = portfolio_data.get_portfolio_nav(time_period=time_period)
-    if add_benchmarks_to_navs:
-        benchmark_prices_ = benchmark_prices
-        joint_prices = pd.concat([portfolio_nav, benchmark_prices_], axis=1).dropna()
-        pivot_prices = joint_prices[regime_benchmark]
-    else:
-        benchmark_prices_ = benchmark_prices[regime_benchmark]
-        joint_prices = pd.concat([portfolio_nav, benchmark_prices_], axis=1).dropna()
-        pivot_prices = joint_prices[regime_benchmark]
-        joint_prices = joint_prices[portfolio_nav.name]
-
     ax = fig.add_subplot(gs[0:2, :2])
-    qis.plot_prices(prices=joint_prices,
+    qis.plot_prices(prices=cache.joint_prices,
                     perf_params=perf_params,
-                    title=f"Cumulative performance with background colors using bear/normal/bull regimes of {regime_benchmark} {regime_params.freq}-returns",
+                    title=f"Cumulative performance with background colors using bear/normal/bull regimes of {cache.regime_benchmark_price.name} {regime_params.freq}-returns",
                     ax=ax,
                     **kwargs)
-    qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
     qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
     # dd
     ax = fig.add_subplot(gs[2:4, :2])
-    qis.plot_rolling_drawdowns(prices=joint_prices,
+    qis.plot_rolling_drawdowns(prices=cache.joint_prices,
                                title='Running Drawdowns',
                                dd_legend_type=dd_legend_type,
+                               drawdowns=cache.drawdowns,
                                ax=ax, **kwargs)
-    qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
     qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
     # under watre
     ax = fig.add_subplot(gs[4:6, :2])
-    qis.plot_rolling_time_under_water(prices=joint_prices,
+    qis.plot_rolling_time_under_water(prices=cache.joint_prices,
                                       title='Running Time under Water',
                                       dd_legend_type=dd_legend_type,
+                                      time_under_water=cache.time_under_water,
                                       ax=ax, **kwargs)
-    qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
     qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
     # rolling performance
@@ -126,64 +502,49 @@ def generate_strategy_factsheet(portfolio_data: PortfolioData,
                                      rolling_window=return_rolling_window,
                                      time_period=time_period,
                                      ax=ax,
-                                     **qis.update_kwargs(kwargs, dict(trend_line=qis.TrendLine.ZERO_SHADOWS)))
-    qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
+                                     **{**kwargs, 'trend_line': qis.TrendLine.ZERO_SHADOWS})
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
     qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
     # exposures
-    exposures = portfolio_data.get_weights(is_grouped=is_grouped, time_period=time_period, add_total=False)
     ax = fig.add_subplot(gs[8:10, :2])
-    if exposures_freq is not None:
-        exposures = exposures.resample(exposures_freq).last()
-    qis.plot_stack(df=exposures,
+    qis.plot_stack(df=cache.exposures,
                    use_bar_plot=True,
                    title='Exposures',
                    legend_stats=qis.LegendStats.AVG_NONNAN_LAST,
                    var_format='{:.1%}',
                    ax=ax,
-                   **qis.update_kwargs(kwargs, dict(bbox_to_anchor=(0.5, 1.05), ncols=2)))
+                   **{**kwargs, 'bbox_to_anchor': (0.5, 1.05), 'ncols': 2})
     qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
     # turnover
     ax = fig.add_subplot(gs[10:12, :2])
-    turnover = portfolio_data.get_turnover(time_period=time_period, roll_period=turnover_rolling_period,
-                                           freq=turnover_freq,
-                                           is_grouped=is_grouped)
-    freq = pd.infer_freq(turnover.index)
-    turnover_title = f"{turnover_rolling_period}-period rolling {freq}-freq Turnover"
-    qis.plot_time_series(df=turnover,
+    turnover_title = f"{turnover_rolling_period}-period rolling {cache.freq}-freq Turnover"
+    qis.plot_time_series(df=cache.turnover,
                          var_format='{:,.2%}',
                          # y_limits=(0.0, None),
                          legend_stats=qis.LegendStats.AVG_NONNAN_LAST,
                          title=turnover_title,
                          ax=ax,
                          **kwargs)
-    qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
     qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
     # costs
     ax = fig.add_subplot(gs[12:14, :2])
-    costs = portfolio_data.get_costs(time_period=time_period, roll_period=turnover_rolling_period,
-                                     freq=turnover_freq,
-                                     is_grouped=is_grouped,
-                                     is_norm_costs=is_norm_costs)
-    freq = pd.infer_freq(costs.index)
-    costs_title = f"{turnover_rolling_period}-period rolling {freq}-freq Costs"
-    qis.plot_time_series(df=costs,
+    costs_title = f"{turnover_rolling_period}-period rolling {cache.freq}-freq Costs"
+    qis.plot_time_series(df=cache.costs,
                          var_format='{:,.2%}',
                          # y_limits=(0.0, None),
                          legend_stats=qis.LegendStats.AVG_NONNAN_LAST,
                          title=costs_title,
                          ax=ax,
                          **kwargs)
-    qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
     qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
     # ra perf table
-    if add_benchmarks_to_navs:
-        benchmark_price1 = benchmark_prices
-    else:
-        benchmark_price1 = benchmark_prices[regime_benchmark]
+    benchmark_price1 = cache.benchmark_price1
     if is_grouped:
         ax = fig.add_subplot(gs[:2, 2:])
         portfolio_data.plot_ra_perf_table(ax=ax,
@@ -191,7 +552,7 @@ def generate_strategy_factsheet(portfolio_data: PortfolioData,
                                           time_period=time_period,
                                           perf_params=perf_params,
                                           is_grouped=is_grouped,
-                                          **qis.update_kwargs(kwargs, dict(fontsize=fontsize)))
+                                          **kwargs)
     else:  # plot two tables
         ax = fig.add_subplot(gs[0, 2:])
         portfolio_data.plot_ra_perf_table(ax=ax,
@@ -199,14 +560,14 @@ def generate_strategy_factsheet(portfolio_data: PortfolioData,
                                           time_period=time_period,
                                           perf_params=perf_params,
                                           is_grouped=is_grouped,
-                                          **qis.update_kwargs(kwargs, dict(fontsize=fontsize)))
+                                          **kwargs)
         ax = fig.add_subplot(gs[1, 2:])
         # change regression to weekly
-        time_period1 = qis.get_time_period_shifted_by_years(time_period=time_period)
-        if pd.infer_freq(benchmark_prices.index) in ['B', 'D']:
-            local_kwargs = qis.update_kwargs(kwargs, dict(time_period=time_period1, alpha_an_factor=52, freq_reg='W-WED', fontsize=fontsize))
+        time_period1 = cache.time_period_1y
+        if cache.benchmark_freq in DAILY_FREQS:
+            local_kwargs = {**kwargs, 'time_period': time_period1, 'alpha_an_factor': 52, 'freq_reg': 'W-WED'}
         else:
-            local_kwargs = qis.update_kwargs(kwargs, dict(time_period=time_period1, fontsize=fontsize))
+            local_kwargs = {**kwargs, 'time_period': time_period1}
         portfolio_data.plot_ra_perf_table(ax=ax,
                                           benchmark_price=benchmark_price1,
                                           perf_params=perf_params,
@@ -218,12 +579,11 @@ def generate_strategy_factsheet(portfolio_data: PortfolioData,
     portfolio_data.plot_monthly_returns_heatmap(ax=ax,
                                                 time_period=time_period,
                                                 title='Monthly Returns',
-                                                **qis.update_kwargs(kwargs, dict(fontsize=fontsize, date_format='%Y')))
+                                                **{**kwargs, 'date_format': '%Y'})
 
     # periodic returns
     ax = fig.add_subplot(gs[4:6, 2:])
-    local_kwargs = qis.update_kwargs(kwargs=kwargs,
-                                     new_kwargs=dict(fontsize=fontsize, square=False, x_rotation=90, transpose=True))
+    local_kwargs = {**kwargs, 'square': False, 'x_rotation': 90, 'transpose': True}
     portfolio_data.plot_periodic_returns(benchmark_prices=benchmark_price1,
                                          is_grouped=is_grouped,
                                          time_period=time_period,
@@ -232,7 +592,7 @@ def generate_strategy_factsheet(portfolio_data: PortfolioData,
 
     # regime data
     portfolio_data.plot_regime_data(is_grouped=is_grouped,
-                                    benchmark_price=benchmark_prices[regime_benchmark],
+                                    benchmark_price=cache.regime_benchmark_price,
                                     time_period=time_period,
                                     perf_params=perf_params,
                                     regime_params=regime_params,
@@ -240,7 +600,7 @@ def generate_strategy_factsheet(portfolio_data: PortfolioData,
                                     **kwargs)
 
     # perf attribution
-    local_kwargs = qis.update_kwargs(kwargs=kwargs, new_kwargs=dict(legend_loc=None))
+    local_kwargs = {**kwargs, 'legend_loc': None}
     with sns.axes_style("whitegrid"):
         portfolio_data.plot_performance_attribution(time_period=time_period,
                                                     attribution_metric=qis.AttributionMetric.PNL,
@@ -253,348 +613,410 @@ def generate_strategy_factsheet(portfolio_data: PortfolioData,
 
     # constituents
     ax = fig.add_subplot(gs[12:, 2:])
-    num_investable_instruments = portfolio_data.get_num_investable_instruments(time_period=time_period)
-    qis.plot_time_series(df=num_investable_instruments,
+    qis.plot_time_series(df=cache.num_investable_instruments,
                          var_format='{:,.0f}',
                          legend_stats=qis.LegendStats.FIRST_AVG_LAST,
                          title='Number of investable and invested instruments',
                          ax=ax,
                          **kwargs)
-    qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
+    qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
+    return fig
+
+
+def generate_var_risk_sheet(portfolio_data: PortfolioData,
+                            cache: FactsheetCache,
+                            time_period: TimePeriod,
+                            perf_params: PerfParams = PERF_PARAMS,
+                            regime_params: BenchmarkReturnsQuantileRegimeSpecs = REGIME_PARAMS,
+                            is_grouped: bool = True,
+                            vol_rolling_window: int = 13,
+                            factor_beta_span: int = 52,
+                            beta_freq: str = 'W-WED',
+                            figsize: Tuple[float, float] = (8.5, 11.7),
+                            **kwargs
+                            ) -> plt.Figure:
+    """
+    sheet with current and historical var, vols and benchmark betas
+    """
+    benchmark_prices = cache.benchmark_prices
+
+    # qqq
+    fig = plt.figure(figsize=figsize, constrained_layout=False)
+    fig.subplots_adjust(left=0.04, right=0.99, top=0.95, bottom=0.08, wspace=0.2, hspace=0.7)
+    fig.suptitle(f"{portfolio_data.nav.name} 99%-Var and risk profile", fontweight="bold", fontsize=8, color='blue')
+    gs = fig.add_gridspec(nrows=7, ncols=4)
+
+    # current var grouped
+    with sns.axes_style("whitegrid"):
+        axs = [fig.add_subplot(gs[0, 0]), fig.add_subplot(gs[0, 1]), fig.add_subplot(gs[0, 2]), fig.add_subplot(gs[0, 3])]
+        portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.LAST,
+                                        is_grouped=True, is_correlated=False, time_period=time_period,
+                                        ax=axs[0], **kwargs)
+        portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.MAX,
+                                        is_grouped=True, is_correlated=False, time_period=time_period,
+                                        ax=axs[1], **kwargs)
+
+        portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.LAST,
+                                        is_grouped=True, is_correlated=True, time_period=time_period,
+                                        ax=axs[2], **kwargs)
+        portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.MAX,
+                                        is_grouped=True, is_correlated=True, time_period=time_period,
+                                        ax=axs[3], **kwargs)
+        qis.align_y_limits_axs(axs=axs)
+
+    # last / max var by instrument
+    with sns.axes_style("whitegrid"):
+        axs = [fig.add_subplot(gs[1, 0:2]), fig.add_subplot(gs[1, 2:4])]
+        portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.LAST,
+                                        is_grouped=False, is_correlated=False, time_period=time_period,
+                                        ax=axs[0], **kwargs)
+        portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.MAX,
+                                        is_grouped=False, is_correlated=False, time_period=time_period,
+                                        ax=axs[1], **kwargs)
+        qis.align_y_limits_axs(axs=axs)
+
+    # best worst returns
+    with sns.axes_style("whitegrid"):
+        portfolio_data.plot_best_worst_returns(ax=fig.add_subplot(gs[2, 0:2]),
+                                               num_returns=20,
+                                               time_period=time_period,
+                                               title=f"Portfolio Worst/Best 20 returns for {time_period.to_str()}",
+                                               **{**kwargs, 'date_format': '%d%b%Y'})
+        num_assets = 10
+        num_investable_assets = cache.num_investable_instruments.shape[1]
+        if num_investable_assets > 2 * num_assets:
+            pre_title = f"-{num_assets}"
+        else:
+            pre_title = ''
+        portfolio_data.plot_contributors(ax=fig.add_subplot(gs[2, 2]),
+                                         time_period=time_period,
+                                         title=f"Bottom/Top{pre_title} performance contributors {time_period.to_str()}",
+                                         **kwargs)
+        time_period_1y = cache.time_period_1y
+        portfolio_data.plot_contributors(ax=fig.add_subplot(gs[2, 3]),
+                                         time_period=time_period_1y,
+                                         title=f"Bottom/Top-{num_assets} performance contributors {time_period_1y.to_str()}",
+                                         **kwargs)
+
+    # var attribution
+    with sns.axes_style("whitegrid"):
+        portfolio_data.plot_var_stack(is_grouped=True, is_correlated=False,
+                                      time_period=time_period,
+                                      ax=fig.add_subplot(gs[3, :2]),
+                                      **kwargs)
+        portfolio_data.plot_var_stack(is_grouped=True, is_correlated=True,
+                                      time_period=time_period,
+                                      ax=fig.add_subplot(gs[3, 2:]),
+                                      **kwargs)
+
+    # var time series - independent
+    ax = fig.add_subplot(gs[4, :2])
+    portfolio_data.plot_portfolio_grouped_var(ax=ax,
+                                              is_correlated=False,
+                                              time_period=time_period,
+                                              **kwargs)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
     qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
-    figs = [fig]
-
-    if add_current_position_var_risk_sheet:
-        # qqq
-        fig = plt.figure(figsize=figsize, constrained_layout=True)
-        fig.suptitle(f"{portfolio_data.nav.name} 99%-Var and risk profile", fontweight="bold", fontsize=8, color='blue')
-        figs.append(fig)
-        gs = fig.add_gridspec(nrows=7, ncols=4, wspace=0.0, hspace=0.0)
-
-        # current var grouped
-        with sns.axes_style("whitegrid"):
-            axs = [fig.add_subplot(gs[0, 0]), fig.add_subplot(gs[0, 1]), fig.add_subplot(gs[0, 2]), fig.add_subplot(gs[0, 3])]
-            portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.LAST,
-                                            is_grouped=True, is_correlated=False, time_period=time_period,
-                                            ax=axs[0], **kwargs)
-            portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.MAX,
-                                            is_grouped=True, is_correlated=False, time_period=time_period,
-                                            ax=axs[1], **kwargs)
-
-            portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.LAST,
-                                            is_grouped=True, is_correlated=True, time_period=time_period,
-                                            ax=axs[2], **kwargs)
-            portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.MAX,
-                                            is_grouped=True, is_correlated=True, time_period=time_period,
-                                            ax=axs[3], **kwargs)
-            qis.align_y_limits_axs(axs=axs)
-
-        # last / max var by instrument
-        with sns.axes_style("whitegrid"):
-            axs = [fig.add_subplot(gs[1, 0:2]), fig.add_subplot(gs[1, 2:4])]
-            portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.LAST,
-                                            is_grouped=False, is_correlated=False, time_period=time_period,
-                                            ax=axs[0], **kwargs)
-            portfolio_data.plot_current_var(snapshot_period=qis.SnapshotPeriod.MAX,
-                                            is_grouped=False, is_correlated=False, time_period=time_period,
-                                            ax=axs[1], **kwargs)
-            qis.align_y_limits_axs(axs=axs)
-
-        # best worst returns
-        with sns.axes_style("whitegrid"):
-            portfolio_data.plot_best_worst_returns(ax=fig.add_subplot(gs[2, 0:2]),
-                                                   num_returns=20,
-                                                   time_period=time_period,
-                                                   title=f"Portfolio Worst/Best 20 returns for {time_period.to_str()}",
-                                                   **qis.update_kwargs(kwargs, dict(date_format='%d%b%Y')))
-            num_assets = 10
-            num_investable_assets = len(num_investable_instruments.columns)
-            if num_investable_assets > 2 * num_assets:
-                pre_title = f"-{num_assets}"
-            else:
-                pre_title = ''
-            portfolio_data.plot_contributors(ax=fig.add_subplot(gs[2, 2]),
-                                             time_period=time_period,
-                                             title=f"Bottom/Top{pre_title} performance contributors {time_period.to_str()}",
-                                             **kwargs)
-            time_period_1y = qis.get_time_period_shifted_by_years(time_period=time_period)
-            portfolio_data.plot_contributors(ax=fig.add_subplot(gs[2, 3]),
-                                             time_period=time_period_1y,
-                                             title=f"Bottom/Top-{num_assets} performance contributors {time_period_1y.to_str()}",
-                                             **kwargs)
-
-        # var attribution
-        with sns.axes_style("whitegrid"):
-            portfolio_data.plot_var_stack(is_grouped=True, is_correlated=False,
-                                          time_period=time_period,
-                                          ax=fig.add_subplot(gs[3, :2]),
-                                          **kwargs)
-            portfolio_data.plot_var_stack(is_grouped=True, is_correlated=True,
-                                          time_period=time_period,
-                                          ax=fig.add_subplot(gs[3, 2:]),
-                                          **kwargs)
-
-        # var time series - independent
-        ax = fig.add_subplot(gs[4, :2])
-        portfolio_data.plot_portfolio_grouped_var(ax=ax,
-                                                  is_correlated=False,
-                                                  time_period=time_period,
-                                                  **kwargs)
-        qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
-        qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
-
-        # var time series - correlted
-        ax = fig.add_subplot(gs[4, 2:])
-        portfolio_data.plot_portfolio_grouped_var(ax=ax,
-                                                  is_correlated=True,
-                                                  time_period=time_period,
-                                                  **kwargs)
-        qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
-        qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
+    # var time series - correlted
+    ax = fig.add_subplot(gs[4, 2:])
+    portfolio_data.plot_portfolio_grouped_var(ax=ax,
+                                              is_correlated=True,
+                                              time_period=time_period,
+                                              **kwargs)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
+    qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
-        # vol time series
-        ax = fig.add_subplot(gs[5, 2:])
-        portfolio_data.plot_portfolio_vols(freq=perf_params.freq_vol,
-                                           span=vol_rolling_window,
-                                           time_period=time_period,
-                                           ax=ax,
-                                           **kwargs)
-        qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
-        qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
+    # vol time series
+    ax = fig.add_subplot(gs[5, 2:])
+    portfolio_data.plot_portfolio_vols(freq=perf_params.freq_vol,
+                                       span=vol_rolling_window,
+                                       time_period=time_period,
+                                       ax=ax,
+                                       **kwargs)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
+    qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
-        # benchmark betas
-        ax = fig.add_subplot(gs[5, :2])
-        factor_exposures = portfolio_data.compute_portfolio_benchmark_betas(benchmark_prices=benchmark_prices,
-                                                                            time_period=time_period,
-                                                                            beta_freq=beta_freq,
-                                                                            factor_beta_span=factor_beta_span)
-        factor_beta_title = f"Rolling {factor_beta_span}-span beta of {beta_freq}-freq returns"
-        qis.plot_time_series(df=factor_exposures,
-                             var_format='{:,.2f}',
-                             legend_stats=qis.LegendStats.AVG_NONNAN_LAST,
-                             title=factor_beta_title,
-                             ax=ax,
-                             **kwargs)
-        qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
-        qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
+    # benchmark betas
+    factor_betas = cache.factor_betas
+    if factor_betas is None:
+        factor_betas = portfolio_data.compute_portfolio_benchmark_betas(benchmark_prices=benchmark_prices,
+                                                                        time_period=None,
+                                                                        beta_freq=beta_freq,
+                                                                        factor_beta_span=factor_beta_span)
+    ax = fig.add_subplot(gs[5, :2])
+    factor_exposures = time_period.locate(factor_betas)
+    factor_beta_title = f"Rolling {factor_beta_span}-span beta of {beta_freq}-freq returns"
+    qis.plot_time_series(df=factor_exposures,
+                         var_format='{:,.2f}',
+                         legend_stats=qis.LegendStats.AVG_NONNAN_LAST,
+                         title=factor_beta_title,
+                         ax=ax,
+                         **kwargs)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
+    qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
 
-        # beta attribution
-        ax = fig.add_subplot(gs[6, :2])
-        factor_attribution = portfolio_data.compute_portfolio_benchmark_attribution(benchmark_prices=benchmark_prices,
-                                                                                    beta_freq=beta_freq,
-                                                                                    factor_beta_span=factor_beta_span,
-                                                                                    time_period=time_period)
-        factor_attribution_title = (f"Cumulative return attribution using rolling "
-                                    f"{factor_beta_span}-span beta of {beta_freq}-freq returns")
-        qis.plot_time_series(df=factor_attribution.cumsum(0),
-                             var_format='{:,.0%}',
-                             legend_stats=qis.LegendStats.LAST_NONNAN,
-                             title=factor_attribution_title,
-                             ax=ax,
-                             **kwargs)
-        qis.add_bnb_regime_shadows(ax=ax, pivot_prices=pivot_prices, regime_params=regime_params)
-        qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
-        """
-        # returns scatter
-        with sns.axes_style("whitegrid"):
-            portfolio_data.plot_returns_scatter(ax=fig.add_subplot(gs[6, 2:]),
-                                                benchmark_price=benchmark_prices[regime_benchmark],
-                                                time_period=time_period,
-                                                freq=perf_params.freq_reg,
-                                                is_grouped=is_grouped,
-                                                **kwargs)
+    # beta attribution
+    ax = fig.add_subplot(gs[6, :2])
+    factor_attribution = portfolio_data.compute_portfolio_benchmark_attribution(benchmark_prices=benchmark_prices,
+                                                                                beta_freq=beta_freq,
+                                                                                factor_beta_span=factor_beta_span,
+                                                                                time_period=time_period,
+                                                                                portfolio_benchmark_betas=factor_betas)
+    factor_attribution_title = (f"Cumulative return attribution using rolling "
+                                f"{factor_beta_span}-span beta of {beta_freq}-freq returns")
+    qis.plot_time_series(df=factor_attribution,
+                         cumulative=True,
+                         var_format='{:,.0%}',
+                         legend_stats=qis.LegendStats.LAST_NONNAN,
+                         title=factor_attribution_title,
+                         ax=ax,
+                         **kwargs)
+    qis.add_regime_spans(ax=ax, regime_spans=cache.regime_spans)
+    qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
+    """
+    # returns scatter
+    with sns.axes_style("whitegrid"):
+        portfolio_data.plot_returns_scatter(ax=fig.add_subplot(gs[6, 2:]),
+                                            benchmark_price=cache.regime_benchmark_price,
+                                            time_period=time_period,
+                                            freq=perf_params.freq_reg,
+                                            is_grouped=is_grouped,
+                                            **kwargs)
 
-        """
-        # vol regime data
-        ax = fig.add_subplot(gs[6, 2:])
+    """
+    # vol regime data
+    ax = fig.add_subplot(gs[6, 2:])
+    portfolio_data.plot_vol_regimes(ax=ax,
+                                    benchmark_price=cache.regime_benchmark_price,
+                                    is_grouped=is_grouped,
+                                    time_period=time_period,
+                                    freq=regime_params.freq,
+                                    regime_params=regime_params,
+                                    **kwargs)
+    """
+    if benchmark_prices.shape[1] > 1:
+        ax = fig.add_subplot(gs[12:14, 2:])
         portfolio_data.plot_vol_regimes(ax=ax,
-                                        benchmark_price=benchmark_prices[regime_benchmark],
+                                        benchmark_price=benchmark_prices.iloc[:, 1],
                                         is_grouped=is_grouped,
                                         time_period=time_period,
                                         freq=regime_params.freq,
                                         regime_params=regime_params,
                                         **kwargs)
-        """
-        if len(benchmark_prices.columns) > 1:
-            ax = fig.add_subplot(gs[12:14, 2:])
-            portfolio_data.plot_vol_regimes(ax=ax,
-                                            benchmark_price=benchmark_prices.iloc[:, 1],
-                                            is_grouped=is_grouped,
-                                            time_period=time_period,
-                                            freq=regime_params.freq,
-                                            regime_params=regime_params,
-                                            **kwargs)
-        """
-    if add_weights_turnover_sheet:
-        # qqq
-        fig = plt.figure(figsize=figsize, constrained_layout=True)
-        fig.suptitle(f"{portfolio_data.nav.name} current position profile", fontweight="bold", fontsize=8, color='blue')
-        figs.append(fig)
-        gs = fig.add_gridspec(nrows=7, ncols=4, wspace=0.0, hspace=0.0)
-
-        # current position
-        with sns.axes_style("whitegrid"):
-            portfolio_data.plot_current_weights(is_grouped=False,
-                                                ax=fig.add_subplot(gs[0, :2]), **kwargs)
-            portfolio_data.plot_current_weights(is_grouped=True,
-                                                ax=fig.add_subplot(gs[0, 2:]), **kwargs)
-
-        # change in position
-        with sns.axes_style("whitegrid"):
-            portfolio_data.plot_last_weights_change(is_grouped=False,
-                                                    ax=fig.add_subplot(gs[1, :2]), **kwargs)
-            portfolio_data.plot_last_weights_change(is_grouped=True,
-                                                    ax=fig.add_subplot(gs[1, 2:]), **kwargs)
-
-        # weights for ytd performance attribution
-        with sns.axes_style("whitegrid"):
-            portfolio_data.plot_current_weights(is_grouped=False,
-                                                time_period=ytd_attribution_time_period,
-                                                ax=fig.add_subplot(gs[2, :2]),
-                                                **kwargs)
-            portfolio_data.plot_current_weights(is_grouped=True,
-                                                time_period=ytd_attribution_time_period,
-                                                ax=fig.add_subplot(gs[2, 2:]),
-                                                **kwargs)
-
-        # total and ytd performance attribution
-        with sns.axes_style("whitegrid"):
-            local_kwargs = qis.update_kwargs(kwargs=kwargs, new_kwargs=dict(legend_loc=None))
-            portfolio_data.plot_performance_attribution(time_period=time_period,
-                                                        attribution_metric=qis.AttributionMetric.PNL,
-                                                        ax=fig.add_subplot(gs[3, :2]),
-                                                        **local_kwargs)
-            portfolio_data.plot_performance_attribution(time_period=ytd_attribution_time_period,
-                                                        attribution_metric=qis.AttributionMetric.PNL,
-                                                        ax=fig.add_subplot(gs[3, 2:]),
-                                                        **local_kwargs)
-        # turnover
-        with sns.axes_style("whitegrid"):
-            local_kwargs = qis.update_kwargs(kwargs=kwargs, new_kwargs=dict(legend_loc=None))
-            portfolio_data.plot_performance_attribution(time_period=time_period,
-                                                        attribution_metric=qis.AttributionMetric.TURNOVER,
-                                                        ax=fig.add_subplot(gs[4, :2]),
-                                                        **local_kwargs)
-            portfolio_data.plot_performance_attribution(time_period=ytd_attribution_time_period,
-                                                        attribution_metric=qis.AttributionMetric.TURNOVER,
-                                                        ax=fig.add_subplot(gs[4, 2:]),
-                                                        **local_kwargs)
-
-        # vol adjusted turnover
-        with sns.axes_style("whitegrid"):
-            local_kwargs = qis.update_kwargs(kwargs=kwargs, new_kwargs=dict(legend_loc=None))
-            portfolio_data.plot_performance_attribution(time_period=time_period,
-                                                        attribution_metric=qis.AttributionMetric.VOL_ADJUSTED_TURNOVER,
-                                                        ax=fig.add_subplot(gs[5, :2]),
-                                                        **local_kwargs)
-            portfolio_data.plot_performance_attribution(time_period=ytd_attribution_time_period,
-                                                        attribution_metric=qis.AttributionMetric.VOL_ADJUSTED_TURNOVER,
-                                                        ax=fig.add_subplot(gs[5, 2:]),
-                                                        **local_kwargs)
-
-        # costs
-        with sns.axes_style("whitegrid"):
-            local_kwargs = qis.update_kwargs(kwargs=kwargs, new_kwargs=dict(legend_loc=None, is_norm_costs=is_norm_costs))
-            portfolio_data.plot_performance_attribution(time_period=time_period,
-                                                        attribution_metric=qis.AttributionMetric.COSTS,
-                                                        ax=fig.add_subplot(gs[6, :2]),
-                                                        **local_kwargs)
-            portfolio_data.plot_performance_attribution(time_period=ytd_attribution_time_period,
-                                                        attribution_metric=qis.AttributionMetric.COSTS,
-                                                        ax=fig.add_subplot(gs[6, 2:]),
-                                                        **local_kwargs)
+    """
+    return fig
+
+
+def generate_weights_turnover_sheet(portfolio_data: PortfolioData,
+                                    time_period: TimePeriod,
+                                    ytd_attribution_time_period: TimePeriod = qis.get_ytd_time_period(),
+                                    is_norm_costs: bool = True,
+                                    figsize: Tuple[float, float] = (8.5, 11.7),
+                                    **kwargs
+                                    ) -> plt.Figure:
+    """
+    sheet with current weights and attribution of pnl, turnover and costs
+    """
+    # qqq
+    fig = plt.figure(figsize=figsize, constrained_layout=False)
+    fig.subplots_adjust(left=0.04, right=0.99, top=0.95, bottom=0.03, wspace=0.15, hspace=0.45)
+    fig.suptitle(f"{portfolio_data.nav.name} current position profile", fontweight="bold", fontsize=8, color='blue')
+    gs = fig.add_gridspec(nrows=7, ncols=4)
+
+    # current position
+    with sns.axes_style("whitegrid"):
+        portfolio_data.plot_current_weights(is_grouped=False,
+                                            ax=fig.add_subplot(gs[0, :2]), **kwargs)
+        portfolio_data.plot_current_weights(is_grouped=True,
+                                            ax=fig.add_subplot(gs[0, 2:]), **kwargs)
 
-    if add_current_signal_report and portfolio_data.strategy_signal_data is not None:
-        fig = qis.generate_current_signal_report(portfolio_data=portfolio_data,
-                                                 **qis.update_kwargs(kwargs, dict(fontsize=5, figsize=figsize,
-                                                                                  y_limits=y_limits_signal)))
-        figs.append(fig)
+    # change in position
+    with sns.axes_style("whitegrid"):
+        portfolio_data.plot_last_weights_change(is_grouped=False,
+                                                ax=fig.add_subplot(gs[1, :2]), **kwargs)
+        portfolio_data.plot_last_weights_change(is_grouped=True,
+                                                ax=fig.add_subplot(gs[1, 2:]), **kwargs)
 
-    if add_weight_change_report and portfolio_data.strategy_signal_data is not None:
-        fig = qis.generate_weight_change_report(portfolio_data=portfolio_data,
-                                                time_period=weight_report_time_period or time_period,
-                                                sample_size=weight_change_sample_size,
-                                                is_grouped=True,
-                                                **qis.update_kwargs(kwargs, dict(fontsize=5, figsize=figsize)))
-        figs.append(fig)
+    # weights for ytd performance attribution
+    with sns.axes_style("whitegrid"):
+        portfolio_data.plot_current_weights(is_grouped=False,
+                                            time_period=ytd_attribution_time_period,
+                                            ax=fig.add_subplot(gs[2, :2]),
+                                            **kwargs)
+        portfolio_data.plot_current_weights(is_grouped=True,
+                                            time_period=ytd_attribution_time_period,
+                                            ax=fig.add_subplot(gs[2, 2:]),
+                                            **kwargs)
 
-    # set 1y time period for exposures
-    if is_1y_exposures:
-        time_period1 = qis.get_time_period_shifted_by_years(time_period=time_period)
-        regime_params1 = BenchmarkReturnsQuantileRegimeSpecs(freq='ME')
-    else:
-        time_period1 = weight_report_time_period or time_period
-        regime_params1 = regime_params
+    # total and ytd performance attribution
+    with sns.axes_style("whitegrid"):
+        local_kwargs = {**kwargs, 'legend_loc': None}
+        portfolio_data.plot_performance_attribution(time_period=time_period,
+                                                    attribution_metric=qis.AttributionMetric.PNL,
+                                                    ax=fig.add_subplot(gs[3, :2]),
+                                                    **local_kwargs)
+        portfolio_data.plot_performance_attribution(time_period=ytd_attribution_time_period,
+                                                    attribution_metric=qis.AttributionMetric.PNL,
+                                                    ax=fig.add_subplot(gs[3, 2:]),
+                                                    **local_kwargs)
+    # turnover
+    with sns.axes_style("whitegrid"):
+        local_kwargs = {**kwargs, 'legend_loc': None}
+        portfolio_data.plot_performance_attribution(time_period=time_period,
+                                                    attribution_metric=qis.AttributionMetric.TURNOVER,
+                                                    ax=fig.add_subplot(gs[4, :2]),
+                                                    **local_kwargs)
+        portfolio_data.plot_performance_attribution(time_period=ytd_attribution_time_period,
+                                                    attribution_metric=qis.AttributionMetric.TURNOVER,
+                                                    ax=fig.add_subplot(gs[4, 2:]),
+                                                    **local_kwargs)
 
-    if add_grouped_exposures:
-        grouped_exposures_agg, grouped_exposures_by_inst = portfolio_data.get_grouped_long_short_exposures(time_period=time_period1)
-        nrows = len(grouped_exposures_agg.keys())
-        fig1 = plt.figure(figsize=figsize, constrained_layout=True)
-        figs.append(fig1)
-        fig1.suptitle(f"{portfolio_data.nav.name} Exposures by groups for period {time_period1.to_str()}",
-                     fontweight="bold", fontsize=8, color='blue')
-        gs = fig1.add_gridspec(nrows=nrows, ncols=2, wspace=0.0, hspace=0.0)
-        local_kwargs = qis.update_kwargs(kwargs=kwargs, new_kwargs=dict(framealpha=0.9))
-        for idx, (group, exposures_agg) in enumerate(grouped_exposures_agg.items()):
-            datas = {f"{group} aggregated": grouped_exposures_agg[group],
-                     f"{group} by instrument": grouped_exposures_by_inst[group]}
-            for idx_, (key, df) in enumerate(datas.items()):
-                ax = fig1.add_subplot(gs[idx, idx_])
-                qis.plot_time_series(df=df,
-                                     var_format='{:,.0%}',
-                                     legend_stats=qis.LegendStats.AVG_MIN_MAX_LAST,
-                                     title=f"{key}",
-                                     ax=ax,
-                                     **local_kwargs)
-                qis.add_bnb_regime_shadows(ax=ax, pivot_prices=time_period1.locate(pivot_prices),
-                                           regime_params=regime_params1)
-                qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
-                ax.axhline(0, color='black', linewidth=0.5)
+    # vol adjusted turnover
+    with sns.axes_style("whitegrid"):
+        local_kwargs = {**kwargs, 'legend_loc': None}
+        portfolio_data.plot_performance_attribution(time_period=time_period,
+                                                    attribution_metric=qis.AttributionMetric.VOL_ADJUSTED_TURNOVER,
+                                                    ax=fig.add_subplot(gs[5, :2]),
+                                                    **local_kwargs)
+        portfolio_data.plot_performance_attribution(time_period=ytd_attribution_time_period,
+                                                    attribution_metric=qis.AttributionMetric.VOL_ADJUSTED_TURNOVER,
+                                                    ax=fig.add_subplot(gs[5, 2:]),
+                                                    **local_kwargs)
 
-    if add_grouped_cum_pnl:
-        grouped_pnls_agg, grouped_pnls_by_inst = portfolio_data.get_grouped_cum_pnls(time_period=time_period1)
-        nrows = len(grouped_pnls_agg.keys())
-        fig1 = plt.figure(figsize=figsize, constrained_layout=True)
-        figs.append(fig1)
-        fig1.suptitle(f"{portfolio_data.nav.name} P&L by groups for period {time_period1.to_str()}",
-                     fontweight="bold", fontsize=8, color='blue')
-        gs = fig1.add_gridspec(nrows=nrows, ncols=2, wspace=0.0, hspace=0.0)
-        local_kwargs = qis.update_kwargs(kwargs=kwargs, new_kwargs=dict(framealpha=0.9))
-        for idx, (group, pnls_agg) in enumerate(grouped_pnls_agg.items()):
-            datas = {f"{group} aggregated": grouped_pnls_agg[group],
-                     f"{group} by instrument": grouped_pnls_by_inst[group]}
-            for idx_, (key, df) in enumerate(datas.items()):
-                ax = fig1.add_subplot(gs[idx, idx_])
-                qis.plot_time_series(df=df,
-                                     var_format='{:,.0%}',
-                                     legend_stats=qis.LegendStats.LAST_NONNAN,
-                                     title=f"{key}",
-                                     ax=ax,
-                                     **local_kwargs)
-                qis.add_bnb_regime_shadows(ax=ax,
-                                           pivot_prices=time_period1.locate(pivot_prices),
-                                           regime_params=regime_params1)
-                qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
+    # costs
+    with sns.axes_style("whitegrid"):
+        local_kwargs = {**kwargs, 'legend_loc': None, 'is_norm_costs': is_norm_costs}
+        portfolio_data.plot_performance_attribution(time_period=time_period,
+                                                    attribution_metric=qis.AttributionMetric.COSTS,
+                                                    ax=fig.add_subplot(gs[6, :2]),
+                                                    **local_kwargs)
+        portfolio_data.plot_performance_attribution(time_period=ytd_attribution_time_period,
+                                                    attribution_metric=qis.AttributionMetric.COSTS,
+                                                    ax=fig.add_subplot(gs[6, 2:]),
+                                                    **local_kwargs)
+    return fig
+
+
+def generate_grouped_exposures_sheet(portfolio_data: PortfolioData,
+                                     cache: FactsheetCache,
+                                     time_period: TimePeriod,
+                                     regime_params: BenchmarkReturnsQuantileRegimeSpecs = REGIME_PARAMS,
+                                     regime_spans: Optional[List[Tuple[pd.Timestamp, pd.Timestamp, str]]] = None,
+                                     figsize: Tuple[float, float] = (8.5, 11.7),
+                                     **kwargs
+                                     ) -> plt.Figure:
+    """
+    sheet with aggregated and instrument exposures by groups
+    regime_spans can be passed to share the shadows of time_period computed by caller
+    """
+    if regime_spans is None:
+        regime_spans = qis.compute_bnb_regime_spans(pivot_prices=time_period.locate(cache.pivot_prices),
+                                                    regime_params=regime_params)
+    grouped_exposures_agg, grouped_exposures_by_inst = portfolio_data.get_grouped_long_short_exposures(time_period=time_period)
+    nrows = len(grouped_exposures_agg.keys())
+    fig1 = plt.figure(figsize=figsize, constrained_layout=False)
+    fig1.subplots_adjust(left=0.04, right=0.99, top=0.95, bottom=0.03, wspace=0.1, hspace=0.2)
+    fig1.suptitle(f"{portfolio_data.nav.name} Exposures by groups for period {time_period.to_str()}",
+                 fontweight="bold", fontsize=8, color='blue')
+    gs = fig1.add_gridspec(nrows=nrows, ncols=2)
+    local_kwargs = {**kwargs, 'framealpha': 0.9}
+    axs_data = []
+    for idx, (group, exposures_agg) in enumerate(grouped_exposures_agg.items()):
+        datas = {f"{group} aggregated": grouped_exposures_agg[group],
+                 f"{group} by instrument": grouped_exposures_by_inst[group]}
+        for idx_, (key, df) in enumerate(datas.items()):
+            axs_data.append((fig1.add_subplot(gs[idx, idx_]), df, key))
+    plot_grouped_time_series(axs_data=axs_data,
+                             regime_spans=regime_spans,
+                             legend_stats=qis.LegendStats.AVG_MIN_MAX_LAST,
+                             add_zero_line=True,
+                             **local_kwargs)
+    return fig1
+
+
+def generate_grouped_cum_pnl_sheet(portfolio_data: PortfolioData,
+                                   cache: FactsheetCache,
+                                   time_period: TimePeriod,
+                                   regime_params: BenchmarkReturnsQuantileRegimeSpecs = REGIME_PARAMS,
+                                   regime_spans: Optional[List[Tuple[pd.Timestamp, pd.Timestamp, str]]] = None,
+                                   figsize: Tuple[float, float] = (8.5, 11.7),
+                                   **kwargs
+                                   ) -> plt.Figure:
+    """
+    sheet with aggregated and instrument cumulative pnl by groups
+    regime_spans can be passed to share the shadows of time_period computed by caller
+    """
+    if regime_spans is None:
+        regime_spans = qis.compute_bnb_regime_spans(pivot_prices=time_period.locate(cache.pivot_prices),
+                                                    regime_params=regime_params)
+    grouped_pnls_agg, grouped_pnls_by_inst = portfolio_data.get_grouped_cum_pnls(time_period=time_period)
+    nrows = len(grouped_pnls_agg.keys())
+    fig1 = plt.figure(figsize=figsize, constrained_layout=False)
+    fig1.subplots_adjust(left=0.04, right=0.99, top=0.95, bottom=0.03, wspace=0.1, hspace=0.2)
+    fig1.suptitle(f"{portfolio_data.nav.name} P&L by groups for period {time_period.to_str()}",
+                 fontweight="bold", fontsize=8, color='blue')
+    gs = fig1.add_gridspec(nrows=nrows, ncols=2)
+    local_kwargs = {**kwargs, 'framealpha': 0.9}
+    axs_data = []
+    for idx, (group, pnls_agg) in enumerate(grouped_pnls_agg.items()):
+        datas = {f"{group} aggregated": grouped_pnls_agg[group],
+                 f"{group} by instrument": grouped_pnls_by_inst[group]}
+        for idx_, (key, df) in enumerate(datas.items()):
+            axs_data.append((fig1.add_subplot(gs[idx, idx_]), df, key))
+    plot_grouped_time_series(axs_data=axs_data,
+                             regime_spans=regime_spans,
+                             legend_stats=qis.LegendStats.LAST_NONNAN,
+                             add_zero_line=False,
+                             **local_kwargs)
+    return fig1
+
+
+def plot_grouped_time_series(axs_data: List[Tuple[plt.Subplot, pd.DataFrame, str]],
+                             regime_spans: List[Tuple[pd.Timestamp, pd.Timestamp, str]],
+                             legend_stats: qis.LegendStats = qis.LegendStats.LAST_NONNAN,
+                             add_zero_line: bool = False,
+                             **kwargs
+                             ) -> None:
+    """
+    plot (ax, df, title) data of grouped sheets, axes must be created beforehand
+    """
+    for ax, df, title in axs_data:
+        qis.plot_time_series(df=df,
+                             var_format='{:,.0%}',
+                             legend_stats=legend_stats,
+                             title=f"{title}",
+                             ax=ax,
+                             **kwargs)
+        qis.add_regime_spans(ax=ax, regime_spans=regime_spans)
+        qis.set_spines(ax=ax, bottom_spine=False, left_spine=False)
+        if add_zero_line:
+            ax.axhline(0, color='black', linewidth=0.5)
+
+
+def generate_instrument_history_sheet(portfolio_data: PortfolioData,
+                                      df_to_add: pd.DataFrame = None,
+                                      figsize: Tuple[float, float] = (8.5, 11.7),
+                                      **kwargs
+                                      ) -> plt.Figure:
+    """
+    sheet with performance history of instruments in portfolio universe
+    """
+    if df_to_add is None:
+        ac_data = portfolio_data.group_data.to_frame(name='AC')
+        if portfolio_data.instrument_names is not None:
+            df_to_add = pd.concat([portfolio_data.instrument_names.rename('Name'),
+                                   ac_data], axis=1)
+        else:
+            df_to_add = ac_data
 
-    if add_instrument_history_report:
-        if df_to_add is None:
-            ac_data = portfolio_data.group_data.to_frame(name='AC')
-            if portfolio_data.instrument_names is not None:
-                df_to_add = pd.concat([portfolio_data.instrument_names.rename('Name'),
-                                       ac_data], axis=1)
-            else:
-                df_to_add = ac_data
-
-        perf_columns = (qis.PerfStat.START_DATE, qis.PerfStat.END_DATE, qis.PerfStat.PA_RETURN,
-                        qis.PerfStat.VOL, qis.PerfStat.SHARPE_RF0,
-                        qis.PerfStat.MAX_DD, qis.PerfStat.MAX_DD_VOL, qis.PerfStat.SKEWNESS)
-
-        fig = qis.generate_price_history_report(prices=portfolio_data.prices,
-                                                **qis.update_kwargs(kwargs, dict(fontsize=4, figsize=figsize,
-                                                                                 perf_columns=perf_columns,
-                                                                                 df_to_add=df_to_add)))
-        fig.suptitle('Program Instrument Universe', fontweight="bold", fontsize=8, color='blue')
-        figs.append(fig)
+    perf_columns = (qis.PerfStat.START_DATE, qis.PerfStat.END_DATE, qis.PerfStat.PA_RETURN,
+                    qis.PerfStat.VOL, qis.PerfStat.SHARPE_RF0,
+                    qis.PerfStat.MAX_DD, qis.PerfStat.MAX_DD_VOL, qis.PerfStat.SKEWNESS)
 
-    return figs
+    fig = qis.generate_price_history_report(prices=portfolio_data.prices,
+                                            **{**kwargs, 'fontsize': 4, 'figsize': figsize,
+                                               'perf_columns': perf_columns, 'df_to_add': df_to_add})
+    fig.suptitle('Program Instrument Universe', fontweight="bold", fontsize=8, color='blue')
+    return fig
@@ -199,7 +199,9 @@ from qis.utils.ols import (
     estimate_alpha_beta_paired_dfs,
     estimate_ols_alpha_beta,
     fit_ols,
+    fit_poly_ols,
     get_ols_x,
+    PolyFit,
     reg_model_params_to_str
 )
 
@@ -7,7 +7,7 @@ import numpy as np
 import pandas as pd
 from statsmodels import api as sm
 from statsmodels.regression.linear_model import RegressionResults as RegModel
-from typing import Tuple, Union
+from typing import Tuple, Union, NamedTuple
 
 
 def fit_ols(x: np.ndarray,
@@ -84,29 +84,66 @@ def estimate_alpha_beta_paired_dfs(x: pd.DataFrame,
 def get_ols_x(x: np.ndarray, order: int, fit_intercept: bool = True) -> np.ndarray:
     """
     compute powers of x
+    for order > 1 the design matrix [1, x, ..., x^order] is built in one pass with np.vander
     """
     if order == 0:
         x = np.ones_like(x)
-        fit_intercept = False
-    elif order == 1:
-        x = x
-    elif order == 2:
-        x = np.column_stack((x, np.square(x)))
-    elif order == 3:
-        x2 = np.square(x)
-        x = np.column_stack((x, x2, x*x2))
-    elif order == 4:
-        x2 = np.square(x)
-        x = np.column_stack((x, x2, x*x2, x2*x2))
+    elif order == 1:  # x can be 2-d for multivariate regression
+        if fit_intercept:
+            x = sm.add_constant(x)
+    elif 1 < order <= 4:
+        x = np.vander(x, N=order+1, increasing=True)
+        if not fit_intercept:
+            x = x[:, 1:]
     else:
         raise ValueError(f"order = {order} is not implemnted")
-
-    if fit_intercept:
-        x = sm.add_constant(x)
     return x
 
 
-def reg_model_params_to_str(reg_model: RegModel,
+class PolyFit(NamedTuple):
+    """
+    lightweight polynomial ols fit with params and rsquared named as in statsmodels RegressionResults
+    """
+    params: np.ndarray
+    rsquared: float
+    order: int
+    fit_intercept: bool
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """
+        predict at x, unlike RegressionResults.predict x is not the design matrix
+        """
+        x1 = get_ols_x(x=x, order=self.order, fit_intercept=self.fit_intercept)
+        if x1.ndim == 1:
+            x1 = x1[:, np.newaxis]
+        return x1 @ self.params
+
+
+def fit_poly_ols(x: np.ndarray,
+                 y: np.ndarray,
+                 order: int = 1,
+                 fit_intercept: bool = True
+                 ) -> Tuple[PolyFit, np.ndarray]:
+    """
+    least squares fit of y on powers of x without building statsmodels results
+    returns the fit and the in-sample prediction
+    """
+    x1 = get_ols_x(x=x, order=order, fit_intercept=fit_intercept)
+    if x1.ndim == 1:
+        x1 = x1[:, np.newaxis]
+    params = np.linalg.lstsq(x1, y, rcond=None)[0]
+    prediction = x1 @ params
+    resid = y - prediction
+    if fit_intercept or order == 0:  # centered r2 for models with constant as in statsmodels
+        y_c = y - np.mean(y)
+    else:
+        y_c = y
+    tss = np.dot(y_c, y_c)
+    rsquared = 1.0 - np.dot(resid, resid) / tss if tss > 0.0 else 0.0
+    return PolyFit(params=params, rsquared=rsquared, order=order, fit_intercept=fit_intercept), prediction
+
+
+def reg_model_params_to_str(reg_model: Union[RegModel, PolyFit],
                             order: int,
                             r2_only: bool = False,
                             beta_format: str = '{0:+0.2f}',